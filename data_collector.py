@@ -2,28 +2,83 @@
 数据收集模块 - 负责从网络获取CSV数据、估值数据和国债收益率数据
 """
 
+import functools
+import hashlib
 import requests
 import pandas as pd
 import logging
 from typing import Optional, Dict, Any
 import io
 import os
+import tempfile
 import akshare as ak
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# 共享的HTTP会话（连接池复用，多个指数的下载无需重复建立TCP/TLS连接）
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                       max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]))
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+# 安装了可选依赖 python-calamine 且 pandas>=2.2 时，使用Rust实现的calamine引擎解析Excel，
+# 否则使用pandas默认引擎（.xls 为 xlrd）
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = 'calamine' if tuple(int(v) for v in pd.__version__.split('.')[:2]) >= (2, 2) else None
+except ImportError:
+    _EXCEL_ENGINE = None
+
+def _atomic_write(path: str, data: bytes):
+    """
+    原子地写入文件：先写入同目录下的临时文件，再替换目标文件，
+    进程中途退出时不会留下写了一半的文件
+    
+    Args:
+        path: 目标文件路径
+        data: 文件内容
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+@functools.lru_cache(maxsize=4)
+def _fetch_bond_china_yield(day: date) -> pd.DataFrame:
+    """
+    获取国债收益率曲线数据（按日期缓存，同一天内只请求一次）
+    
+    Args:
+        day: 当前日期，作为缓存键
+        
+    Returns:
+        pandas.DataFrame: AKShare返回的收益率曲线数据（只读，调用方不应修改）
+    """
+    return ak.bond_china_yield()
+
 class DataCollector:
     """数据收集器"""
     
-    def __init__(self, csv_url: str = None):
+    def __init__(self, csv_url: str = None, session: requests.Session = None, cache_dir: str = None):
         """
         初始化数据收集器
         
         Args:
             csv_url: CSV文件的URL地址
+            session: HTTP会话（可选），默认使用模块共享会话
+            cache_dir: 下载缓存目录（可选），默认读取环境变量HLNOTE_HTTP_CACHE，均未设置时不缓存
         """
+        self.session = session or _SESSION
+        self.cache_dir = cache_dir or os.environ.get('HLNOTE_HTTP_CACHE')
         # 默认使用中证指数的红利低波指数数据（Excel格式）
         self.csv_url = csv_url or "https://csi-web-dev.oss-cn-shanghai-finance-1-pub.aliyuncs.com/static/html/csindex/public/uploads/file/autofile/indicator/930955indicator.xls"
         self.timeout = 30  # 请求超时时间
@@ -49,22 +104,20 @@ class DataCollector:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            response = requests.get(target_url, timeout=self.timeout, headers=headers)
-            response.raise_for_status()  # 检查HTTP状态码
+            content = self._download(target_url, headers)
             
             # 检查响应内容大小
-            if len(response.content) < 1000:  # 最少应该有1KB
-                logger.warning(f"响应内容过短: {len(response.content)} 字节")
+            if len(content) < 1000:  # 最少应该有1KB
+                logger.warning(f"响应内容过短: {len(content)} 字节")
             
             # 判断文件格式并解析
             if target_url.endswith('.xls') or target_url.endswith('.xlsx'):
                 # Excel格式数据
-                df = pd.read_excel(io.BytesIO(response.content))
+                df = pd.read_excel(io.BytesIO(content), engine=_EXCEL_ENGINE)
                 logger.info("检测到Excel格式数据，使用read_excel解析")
             else:
-                # CSV格式数据
-                csv_content = response.content.decode('utf-8')
-                df = pd.read_csv(io.StringIO(csv_content))
+                # CSV格式数据（直接解析字节流，无需先解码为完整字符串）
+                df = pd.read_csv(io.BytesIO(content), encoding='utf-8')
                 logger.info("使用read_csv解析CSV数据")
             
             logger.info(f"成功获取数据，共{len(df)}行记录")
@@ -94,7 +147,7 @@ class DataCollector:
             if os.path.exists(local_file):
                 logger.info(f"尝试使用本地文件: {local_file}")
                 try:
-                    df = pd.read_excel(local_file)
+                    df = pd.read_excel(local_file, engine=_EXCEL_ENGINE)
                     logger.info(f"本地文件读取成功，共{len(df)}行记录")
                     return df
                 except Exception as local_e:
@@ -110,6 +163,73 @@ class DataCollector:
             logger.error(f"数据获取过程中发生未知错误: {str(e)}")
             raise Exception(f"数据获取失败: {str(e)}")
     
+    def _download(self, url: str, headers: Dict[str, str]) -> bytes:
+        """
+        下载文件内容；配置了缓存目录时发送条件请求（ETag/Last-Modified），
+        服务器返回304时直接使用本地缓存，无需重新下载
+        
+        Args:
+            url: 文件URL
+            headers: 请求头
+            
+        Returns:
+            bytes: 文件内容
+            
+        Raises:
+            requests.RequestException: 请求失败时抛出异常
+        """
+        if not self.cache_dir:
+            response = self.session.get(url, timeout=self.timeout, headers=headers)
+            response.raise_for_status()  # 检查HTTP状态码
+            return response.content
+        
+        cache_path = os.path.join(self.cache_dir, hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest())
+        meta_path = cache_path + '.json'
+        
+        # 读取缓存；缓存缺失、损坏或无法读取时按未命中处理，发送普通请求
+        meta, cached_body = {}, None
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if not isinstance(meta, dict):
+                raise ValueError(f"无效的缓存校验信息: {meta_path}")
+            with open(cache_path, 'rb') as f:
+                cached_body = f.read()
+        except (OSError, ValueError) as e:
+            if os.path.exists(meta_path):
+                logger.warning(f"下载缓存不可用，重新下载: {e}")
+            meta, cached_body = {}, None
+        
+        if cached_body is not None:
+            headers = dict(headers)
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        
+        response = self.session.get(url, timeout=self.timeout, headers=headers)
+        if response.status_code == 304 and cached_body is not None:
+            logger.info(f"数据未更新，使用本地缓存: {cache_path}")
+            return cached_body
+        response.raise_for_status()  # 检查HTTP状态码
+        
+        # 只缓存带校验信息的响应，否则下次无法发送条件请求
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # 先删除旧的校验信息，再原子替换内容，最后写入新的校验信息，
+                # 保证校验信息始终对应完整的缓存内容
+                if os.path.exists(meta_path):
+                    os.remove(meta_path)
+                _atomic_write(cache_path, response.content)
+                meta = {'url': url, 'etag': etag, 'last_modified': last_modified}
+                _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+            except OSError as e:
+                logger.warning(f"写入下载缓存失败: {e}")
+        return response.content
+    
     def fetch_valuation_data(self, index_code: str) -> Dict[str, Any]:
         """
         获取指数估值数据（PE）
@@ -190,7 +310,7 @@ class DataCollector:
             logger.info(f"开始获取{bond_type}国债收益率数据")
             
             # 使用AKShare获取国债收益率数据
-            bond_yield_df = ak.bond_china_yield()
+            bond_yield_df = _fetch_bond_china_yield(date.today())
             
             if bond_yield_df.empty:
                 logger.warning("未找到国债收益率数据")
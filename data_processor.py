@@ -102,12 +102,11 @@ class DataProcessor:
                 processed_df['市盈率2（计算用股本）P/E2'], errors='coerce'
             )
         
-        # 按日期降序排序（最新日期在前）
+        # 只保留最近15天的数据，按日期降序排列（最新日期在前）
+        # nlargest 只选出前15行再排序，无需对全部历史数据排序
         if 'date' in processed_df.columns:
-            processed_df = processed_df.sort_values('date', ascending=False)  # 按时间降序排列，最新日期在前
-        
-        # 只保留最近15天的数据
-        if len(processed_df) > 15:
+            processed_df = processed_df.nlargest(15, 'date')
+        elif len(processed_df) > 15:
             processed_df = processed_df.head(15)
             
         logger.debug(f"预处理后数据形状: {processed_df.shape}")
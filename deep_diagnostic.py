@@ -19,6 +19,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 数据源检查时最多读取的字节数（有效文件至少1KB）
+SAMPLE_CHUNK_SIZE = 2 * 1024
+
 def check_environment():
     """检查运行环境"""
     print("=== 环境检查 ===")
@@ -32,7 +35,7 @@ def check_environment():
         print(f"Webhook域名: {webhook.split('/')[2] if '/' in webhook else 'invalid'}")
     
     # 检查必要文件
-    required_files = ['main_multi.py', 'multi_index_analyzer.py', 'dingtalk_sender.py', 'index_config.py']
+    required_files = ['main_multi_fixed.py', 'multi_index_analyzer.py', 'dingtalk_sender.py', 'index_config.py']
     for file in required_files:
         if os.path.exists(file):
             print(f"✅ {file} 存在")
@@ -60,12 +63,17 @@ def check_network_connectivity():
     
     for i, url in enumerate(test_urls, 1):
         try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200 and len(response.content) > 1000:
-                print(f"✅ 数据源{i}访问成功 (大小: {len(response.content)} bytes)")
-            else:
-                print(f"❌ 数据源{i}异常: 状态码{response.status_code}, 大小{len(response.content)}")
-                return False
+            # 流式请求，只读取响应头和首个数据块，不下载整个文件
+            with requests.get(url, stream=True, timeout=10) as response:
+                size = response.headers.get('Content-Length')
+                if size is None:
+                    size = len(next(response.iter_content(chunk_size=SAMPLE_CHUNK_SIZE), b''))
+                size = int(size)
+                if response.status_code == 200 and size > 1000:
+                    print(f"✅ 数据源{i}访问成功 (大小: {size} bytes)")
+                else:
+                    print(f"❌ 数据源{i}异常: 状态码{response.status_code}, 大小{size}")
+                    return False
         except Exception as e:
             print(f"❌ 数据源{i}访问失败: {str(e)}")
             return False
@@ -2,6 +2,7 @@
 钉钉机器人推送模块 - 负责将报告通过钉钉机器人发送
 """
 
+import itertools
 import requests
 import json
 import logging
@@ -9,21 +10,58 @@ import os
 from datetime import datetime
 import base64
 from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# 共享的HTTP会话（保持连接复用，避免每次请求重新进行TLS握手）
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                       max_retries=Retry(total=2, backoff_factor=0.2)))
+
+# 指标卡片中的数值指标及其显示格式
+_CARD_METRICS = (
+    ('current_rate', '.4f'),
+    ('avg_15d', '.4f'),
+    ('max_15d', '.4f'),
+    ('min_15d', '.4f'),
+    ('change_percent', '+.2f'),
+    ('percentile_15d', '.1f')
+)
+
+# 趋势分析和投资建议额外使用的指标（原样传递）
+_ANALYSIS_METRIC_KEYS = ('pe', 'pe_percentile', 'bond_yield', 'dividend_bond_spread', 'investment_advice')
+
+# 缺少数据或转换失败时使用的默认指标（数值类型）
+_DEFAULT_METRICS = {
+    'current_rate': 5.0200,
+    'avg_15d': 5.0200,
+    'max_15d': 5.0900,
+    'min_15d': 4.9900,
+    'change_percent': 0.60,
+    'percentile_15d': 30.0
+}
+
 class DingTalkSender:
     """钉钉机器人发送器"""
     
-    def __init__(self, webhook_url: str = None):
+    # 日报文件名序号（多个报告并发发送时，同一秒内生成的文件名也不重复）
+    _daily_seq = itertools.count()
+    
+    def __init__(self, webhook_url: str = None, session: requests.Session = None):
         """
         初始化钉钉机器人发送器
         
         Args:
             webhook_url: 钉钉机器人webhook地址
+            session: HTTP会话（可选），默认使用模块共享会话
         """
+        self.session = session or _SESSION
         # 优先使用传入的URL，其次使用环境变量，最后使用默认值（仅用于测试）
         self.webhook_url = webhook_url or os.getenv('DINGTALK_WEBHOOK') or "https://oapi.dingtalk.com/robot/send?access_token=0b782dbef56eba11d5f2f136e4247ad5fb3d3022653adb3acd37bdf060b7dfcf"
+        # 首次成功发送后置为True，用作连接测试结果（无需单独发送测试消息）
+        self.connection_ok = False
         
     def send_report(self, html_content: str, chart_path: str = None, index_info: dict = None, processed_data: dict = None) -> bool:
         """
@@ -54,9 +92,7 @@ class DingTalkSender:
             return success
             
         except Exception as e:
-            import traceback
-            logger.error(f"钉钉消息发送过程中发生错误: {str(e)}")
-            logger.error(f"错误堆栈: {traceback.format_exc()}")
+            logger.error("钉钉消息发送过程中发生错误: %s", e, exc_info=True)
             return False
     
     def _build_dingtalk_message(self, html_content: str, chart_path: str = None, index_info: dict = None, processed_data: dict = None) -> dict:
@@ -101,7 +137,9 @@ class DingTalkSender:
             import os
             report_dir = "reports/daily"
             os.makedirs(report_dir, exist_ok=True)
-            daily_report_path = os.path.join(report_dir, f"daily_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html")
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            prefix = f"daily_report_{index_code}_" if index_code else "daily_report_"
+            daily_report_path = os.path.join(report_dir, f"{prefix}{timestamp}_{next(self._daily_seq):03d}.html")
             with open(daily_report_path, 'w', encoding='utf-8') as f:
                 f.write(daily_report_html)
             logger.info(f"日报简洁版已保存: {daily_report_path}")
@@ -129,87 +167,33 @@ class DingTalkSender:
         Returns:
             dict: 提取的指标字典
         """
-        metrics = {}
-        
         # 从处理后的数据中提取真实指标
         if processed_data and 'metrics' in processed_data:
             data_metrics = processed_data['metrics']
-            # 确保数值类型正确
+            # 确保数值类型正确：数值指标一次性转换为float，并附带趋势分析和投资建议使用的其他指标
             try:
-                current_rate = float(data_metrics.get('current_rate', 0))
-                avg_15d = float(data_metrics.get('avg_15d', 0))
-                max_15d = float(data_metrics.get('max_15d', 0))
-                min_15d = float(data_metrics.get('min_15d', 0))
-                change_percent = float(data_metrics.get('change_percent', 0))
-                percentile_15d = float(data_metrics.get('percentile_15d', 0))
-                
-                # 创建转换后的指标字典供趋势分析和投资建议使用
-                converted_metrics = {
-                    'current_rate': current_rate,
-                    'avg_15d': avg_15d,
-                    'max_15d': max_15d,
-                    'min_15d': min_15d,
-                    'change_percent': change_percent,
-                    'percentile_15d': percentile_15d,
-                    'pe': data_metrics.get('pe'),
-                    'pe_percentile': data_metrics.get('pe_percentile'),
-                    'bond_yield': data_metrics.get('bond_yield'),
-                    'dividend_bond_spread': data_metrics.get('dividend_bond_spread'),
-                    'investment_advice': data_metrics.get('investment_advice')
-                }
-                
-                metrics.update({
-                    'current_rate': f"{current_rate:.4f}",
-                    'avg_15d': f"{avg_15d:.4f}",
-                    'max_15d': f"{max_15d:.4f}",
-                    'min_15d': f"{min_15d:.4f}",
-                    'change_percent': f"{change_percent:+.2f}",
-                    'percentile_15d': f"{percentile_15d:.1f}",
-                    'trend_analysis': self._get_trend_analysis(converted_metrics),
-                    'investment_advice': self._get_investment_advice(converted_metrics)
-                })
+                converted_metrics = {key: float(data_metrics.get(key, 0)) for key, _ in _CARD_METRICS}
+                converted_metrics.update({key: data_metrics.get(key) for key in _ANALYSIS_METRIC_KEYS})
+                return self._format_card_metrics(converted_metrics)
             except (ValueError, TypeError) as e:
                 logger.warning(f"数据转换失败，使用默认值: {e}")
-                # 使用默认值（数值类型）
-                default_metrics = {
-                    'current_rate': 5.0200,
-                    'avg_15d': 5.0200,
-                    'max_15d': 5.0900,
-                    'min_15d': 4.9900,
-                    'change_percent': 0.60,
-                    'percentile_15d': 30.0
-                }
-                metrics.update({
-                    'current_rate': f"{default_metrics['current_rate']:.4f}",
-                    'avg_15d': f"{default_metrics['avg_15d']:.4f}",
-                    'max_15d': f"{default_metrics['max_15d']:.4f}",
-                    'min_15d': f"{default_metrics['min_15d']:.4f}",
-                    'change_percent': f"{default_metrics['change_percent']:+.2f}",
-                    'percentile_15d': f"{default_metrics['percentile_15d']:.1f}",
-                    'trend_analysis': self._get_trend_analysis(default_metrics),
-                    'investment_advice': self._get_investment_advice(default_metrics)
-                })
-        else:
-            # 默认值（用于测试，数值类型）
-            default_metrics = {
-                'current_rate': 5.0200,
-                'avg_15d': 5.0200,
-                'max_15d': 5.0900,
-                'min_15d': 4.9900,
-                'change_percent': 0.60,
-                'percentile_15d': 30.0
-            }
-            metrics.update({
-                'current_rate': f"{default_metrics['current_rate']:.4f}",
-                'avg_15d': f"{default_metrics['avg_15d']:.4f}",
-                'max_15d': f"{default_metrics['max_15d']:.4f}",
-                'min_15d': f"{default_metrics['min_15d']:.4f}",
-                'change_percent': f"{default_metrics['change_percent']:+.2f}",
-                'percentile_15d': f"{default_metrics['percentile_15d']:.1f}",
-                'trend_analysis': self._get_trend_analysis(default_metrics),
-                'investment_advice': self._get_investment_advice(default_metrics)
-            })
         
+        # 默认值（用于测试，数值类型）
+        return self._format_card_metrics(_DEFAULT_METRICS)
+    
+    def _format_card_metrics(self, converted_metrics: dict) -> dict:
+        """
+        格式化指标卡片数据，并生成趋势分析和投资建议文本
+        
+        Args:
+            converted_metrics: 已转换为数值类型的指标字典
+            
+        Returns:
+            dict: 格式化后的指标字典
+        """
+        metrics = {key: format(converted_metrics[key], spec) for key, spec in _CARD_METRICS}
+        metrics['trend_analysis'] = self._get_trend_analysis(converted_metrics)
+        metrics['investment_advice'] = self._get_investment_advice(converted_metrics)
         return metrics
     
     def _get_trend_analysis(self, metrics: dict) -> str:
@@ -257,7 +241,7 @@ class DingTalkSender:
         """
         try:
             headers = {'Content-Type': 'application/json'}
-            response = requests.post(
+            response = self.session.post(
                 self.webhook_url,
                 data=json.dumps(message),
                 headers=headers,
@@ -268,6 +252,9 @@ class DingTalkSender:
             logger.debug(f"钉钉API响应: {result}")
             
             if result.get('errcode') == 0:
+                if not self.connection_ok:
+                    self.connection_ok = True
+                    logger.info("✅ 钉钉机器人连接正常")
                 return True
             else:
                 logger.error(f"钉钉API错误: {result.get('errmsg')}")
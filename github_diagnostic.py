@@ -4,32 +4,57 @@ GitHub Actions 环境快速诊断脚本
 专门用于定位导致 exit code 1 的具体问题
 """
 
+import functools
 import os
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# 数据源检查时最多读取的字节数
+SAMPLE_CHUNK_SIZE = 64 * 1024
+
+# 待发送的钉钉调试消息（诊断结束时合并为一条消息发送）
+_notify_buffer = []
+
+@functools.lru_cache(maxsize=1)
+def _get_sender():
+    """获取钉钉发送器（未配置DINGTALK_WEBHOOK时返回None）"""
+    webhook = os.getenv('DINGTALK_WEBHOOK')
+    if not webhook:
+        return None
+    from dingtalk_sender import DingTalkSender
+    return DingTalkSender(webhook_url=webhook)
+
+def _notify(text):
+    """记录调试消息，诊断结束时统一发送到钉钉"""
+    _notify_buffer.append(text)
+
+def _flush_notifications():
+    """将缓存的调试消息合并为一条Markdown消息发送到钉钉（如果配置了）"""
+    if not _notify_buffer:
+        return
+    try:
+        sender = _get_sender()
+        if sender is not None:
+            sender._send_message({
+                "msgtype": "markdown",
+                "markdown": {
+                    "title": "GitHub Actions 环境诊断日志",
+                    "text": "\n\n".join(_notify_buffer)
+                }
+            })
+    except Exception as e:
+        print(f"DEBUG: 钉钉消息发送失败: {str(e)}")
+    finally:
+        _notify_buffer.clear()
+
 def log_step(step_name, status="INFO"):
     """记录步骤执行状态"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     message = f"[{timestamp}] {step_name}"
     print(f"{status}: {message}")
-    
-    # 尝试发送到钉钉（如果配置了）
-    try:
-        webhook = os.getenv('DINGTALK_WEBHOOK')
-        if webhook:
-            from dingtalk_sender import DingTalkSender
-            sender = DingTalkSender(webhook_url=webhook)
-            msg = {
-                "msgtype": "text",
-                "text": {
-                    "content": f"🔍 {message}"
-                }
-            }
-            sender._send_message(msg)
-    except Exception as e:
-        print(f"DEBUG: 钉钉消息发送失败: {str(e)}")
+    _notify(f"🔍 {message}")
 
 def check_python_environment():
     """检查Python环境"""
@@ -89,7 +114,7 @@ def check_working_directory():
         
         # 检查必要文件
         required_files = [
-            'main_multi.py',
+            'main_multi_fixed.py',
             'multi_index_analyzer.py', 
             'dingtalk_sender.py',
             'index_config.py'
@@ -108,30 +133,51 @@ def check_working_directory():
         log_step(f"工作目录检查失败: {str(e)}", "ERROR")
         return False
 
+def _probe_data_source(session, url):
+    """
+    探测数据源是否可访问（流式请求，只读取响应头和首个数据块，不下载整个文件）
+    
+    Returns:
+        tuple: (状态码, 文件大小描述)，状态码非200时大小为None
+    """
+    with session.get(url, stream=True, timeout=10) as response:
+        if response.status_code != 200:
+            return response.status_code, None
+        size = response.headers.get('Content-Length')
+        if size is None:
+            first_chunk = next(response.iter_content(chunk_size=SAMPLE_CHUNK_SIZE), b'')
+            size = f">={len(first_chunk)}"
+        return response.status_code, size
+
 def check_network_access():
     """检查网络访问"""
     log_step("检查网络连接")
     try:
         import requests
-        # 测试基本网络
-        response = requests.get('https://www.baidu.com', timeout=5)
-        log_step(f"✅ 网络连接正常 (状态码: {response.status_code})")
-        
-        # 测试数据源
-        test_urls = [
-            "https://oss-ch.csindex.com.cn/static/html/csindex/public/uploads/file/autofile/indicator/H30269indicator.xls",
-            "https://oss-ch.csindex.com.cn/static/html/csindex/public/uploads/file/autofile/indicator/930955indicator.xls"
-        ]
-        
-        for i, url in enumerate(test_urls, 1):
-            try:
-                response = requests.get(url, timeout=10)
-                if response.status_code == 200:
-                    log_step(f"✅ 数据源{i}可访问 (大小: {len(response.content)} bytes)")
-                else:
-                    log_step(f"⚠️ 数据源{i}访问异常: 状态码 {response.status_code}", "WARNING")
-            except Exception as e:
-                log_step(f"❌ 数据源{i}访问失败: {str(e)}", "ERROR")
+        # 诊断专用会话：百度探测和各数据源探测复用连接，用完即关闭
+        with requests.Session() as session:
+            # 测试基本网络
+            response = session.get('https://www.baidu.com', timeout=5)
+            log_step(f"✅ 网络连接正常 (状态码: {response.status_code})")
+            
+            # 测试数据源
+            test_urls = [
+                "https://oss-ch.csindex.com.cn/static/html/csindex/public/uploads/file/autofile/indicator/H30269indicator.xls",
+                "https://oss-ch.csindex.com.cn/static/html/csindex/public/uploads/file/autofile/indicator/930955indicator.xls"
+            ]
+            
+            # 各数据源并发探测，结果按顺序记录
+            with ThreadPoolExecutor(max_workers=len(test_urls)) as executor:
+                futures = [executor.submit(_probe_data_source, session, url) for url in test_urls]
+            for i, future in enumerate(futures, 1):
+                try:
+                    status_code, size = future.result()
+                    if status_code == 200:
+                        log_step(f"✅ 数据源{i}可访问 (大小: {size} bytes)")
+                    else:
+                        log_step(f"⚠️ 数据源{i}访问异常: 状态码 {status_code}", "WARNING")
+                except Exception as e:
+                    log_step(f"❌ 数据源{i}访问失败: {str(e)}", "ERROR")
         
         return True
     except Exception as e:
@@ -193,6 +239,17 @@ def test_minimal_execution():
         traceback.print_exc()
         return False
 
+# 诊断检查项（名称, 检查函数）
+_CHECKS = (
+    ("Python环境检查", check_python_environment),
+    ("依赖包检查", check_required_packages),
+    ("Matplotlib配置检查", check_matplotlib_backend),
+    ("工作目录检查", check_working_directory),
+    ("网络访问检查", check_network_access),
+    ("钉钉配置检查", check_dingtalk_config),
+    ("最小化执行测试", test_minimal_execution)
+)
+
 def main():
     """主诊断函数"""
     print("=" * 50)
@@ -200,18 +257,8 @@ def main():
     print("=" * 50)
     
     # 执行各项检查
-    checks = [
-        ("Python环境检查", check_python_environment),
-        ("依赖包检查", check_required_packages),
-        ("Matplotlib配置检查", check_matplotlib_backend),
-        ("工作目录检查", check_working_directory),
-        ("网络访问检查", check_network_access),
-        ("钉钉配置检查", check_dingtalk_config),
-        ("最小化执行测试", test_minimal_execution)
-    ]
-    
     results = []
-    for name, func in checks:
+    for name, func in _CHECKS:
         try:
             result = func()
             results.append((name, result))
@@ -234,6 +281,9 @@ def main():
     
     print(f"\n📈 总体结果: {passed}/{total} 项通过")
     
+    _notify(f"📈 总体结果: {passed}/{total} 项通过")
+    _flush_notifications()
+    
     if passed == total:
         print("🎉 所有检查都通过！")
         return 0
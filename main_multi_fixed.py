@@ -2,18 +2,25 @@
 """
 AI投研助手 - 多指数版本主程序
 功能：每日定时获取多个中证指数数据，生成分析报告并通过钉钉分别发送
-简化版：移除所有调试消息，只保留核心功能
+用法：python main_multi_fixed.py [--debug]
+      --debug 输出DEBUG级别日志及每个指数的详细分析/发送结果
 """
 
 import os
-import sys
+
+# 在导入任何可能加载matplotlib的模块之前指定非GUI后端，避免后端自动探测
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import argparse
+import functools
+import platform
+import socket
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 import logging
+from logging.handlers import RotatingFileHandler
 
-# 添加项目路径
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from multi_index_analyzer import MultiIndexAnalyzer, run_multi_index_analysis
 from index_config import IndexConfig, index_manager
 # local_config 模块在GitHub Actions环境中不存在，移除依赖
 
@@ -22,99 +29,153 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('multi_index_dividend_analyzer.log'),
+        RotatingFileHandler('multi_index_dividend_analyzer.log', maxBytes=2_000_000, backupCount=3, encoding='utf-8', delay=True),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 
-def main():
-    """主函数 - 多指数分析"""
-    # 获取钉钉Webhook配置
-    dingtalk_webhook = os.getenv('DINGTALK_WEBHOOK')
+# 日志格式未使用线程/进程字段，关闭采集以减少每条日志记录的开销
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# 网络探测地址（阿里DNS的TCP 53端口，无需DNS解析和TLS握手）
+NETWORK_PROBE_ADDR = ('223.5.5.5', 53)
+
+@functools.lru_cache(maxsize=1)
+def _check_network():
+    """
+    通过TCP连接探测网络连通性（同一进程内只探测一次）
     
-    # 设置matplotlib后端以避免GUI相关问题
+    Returns:
+        str: 错误信息，网络正常时返回None
+    """
     try:
-        import matplotlib
-        matplotlib.use('Agg')  # 使用非GUI后端
-        logger.info("📊 matplotlib后端设置为Agg")
-    except Exception as e:
-        logger.warning(f"matplotlib后端设置失败: {str(e)}")
+        socket.create_connection(NETWORK_PROBE_ADDR, timeout=2).close()
+        return None
+    except OSError as e:
+        return str(e)
+
+@dataclass(frozen=True)
+class RunEnv:
+    """运行环境配置（同一进程内只读取一次）"""
+    webhook: Optional[str]  # 钉钉Webhook地址
+    system: str             # 操作系统
+    release: str            # 系统版本
+    python: str             # Python版本
+    
+    @property
+    def system_info(self) -> str:
+        """系统信息描述"""
+        return f"🖥️ 系统: {self.system} {self.release}, Python: {self.python}"
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> RunEnv:
+    """读取运行环境配置"""
+    return RunEnv(
+        webhook=os.getenv('DINGTALK_WEBHOOK'),
+        system=platform.system(),
+        release=platform.release(),
+        python=platform.python_version()
+    )
+
+def _log_debug_details(analysis_results, send_results):
+    """调试模式下输出每个指数的详细分析和发送结果"""
+    logger.debug("--- 分析详情 ---")
+    for i, result in enumerate(analysis_results):
+        logger.debug("   [%d] %s (%s)", i + 1, result.index_config.name, result.index_config.code)
+        if result.success:
+            logger.debug("       数据行数: %d", len(result.raw_data) if result.raw_data is not None else 0)
+            logger.debug("       报告长度: %d 字符", len(result.report_html) if result.report_html else 0)
+            logger.debug("       图表路径: %s", result.chart_path)
+            logger.debug("       处理数据键: %s", list(result.processed_data) if result.processed_data else None)
+    
+    logger.debug("--- 发送详情 ---")
+    for code, success in send_results.items():
+        logger.debug("   %s: %s", code, '✅ 成功' if success else '❌ 失败')
+
+def main(argv=None):
+    """主函数 - 多指数分析"""
+    parser = argparse.ArgumentParser(description="AI投研助手 - 多指数分析")
+    parser.add_argument('--debug', action='store_true', help="输出DEBUG级别日志和详细结果")
+    args = parser.parse_args(argv)
+    
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+    
+    # 获取运行环境配置
+    env = _load_env()
+    dingtalk_webhook = env.webhook
     
     try:
+        # 延迟导入重量级模块（pandas/matplotlib/akshare），matplotlib后端已由MPLBACKEND指定
+        from multi_index_analyzer import MultiIndexAnalyzer, compute_analysis_stats
+        from dingtalk_sender import DingTalkSender
+        
         logger.info("=== AI投研助手(多指数版)开始执行 ===")
         
         # 系统健康检查
-        import platform
-        system_info = f"🖥️ 系统: {platform.system()} {platform.release()}, Python: {platform.python_version()}"
-        logger.info(system_info)
+        logger.info(env.system_info)
         
         # 检查钉钉Webhook配置
         if dingtalk_webhook:
             logger.info(f"✅ 检测到 DINGTALK_WEBHOOK (长度: {len(dingtalk_webhook)} 字符)")
+            logger.debug("   Webhook URL: %.60s...", dingtalk_webhook)
         else:
             logger.warning("⚠️ 未找到 DINGTALK_WEBHOOK 环境变量")
         
         # 网络连通性检查
-        try:
-            import requests
-            response = requests.get('https://www.baidu.com', timeout=5)
+        network_error = _check_network()
+        if network_error is None:
             logger.info("🌐 网络连接正常")
-        except Exception as e:
-            logger.warning(f"⚠️ 网络连接可能存在问题: {str(e)}")
+        else:
+            logger.warning(f"⚠️ 网络连接可能存在问题: {network_error}")
         
         # 获取指数配置
         indexes = index_manager.get_all_indexes()
         logger.info(f"📊 配置的指数数量: {len(indexes)}")
         
         for idx in indexes:
-            logger.info(f"- {idx.name} ({idx.code}): {idx.url}")
+            logger.info("- %s (%s): %s", idx.name, idx.code, idx.url)
         
-        # 测试钉钉机器人连接
-        if dingtalk_webhook:
-            logger.info("🧪 测试钉钉机器人连接...")
-            try:
-                from dingtalk_sender import DingTalkSender
-                sender = DingTalkSender(webhook_url=dingtalk_webhook)
-                test_result = sender.test_connection()
-                if test_result:
-                    logger.info("✅ 钉钉机器人连接测试成功")
-                else:
-                    logger.error("❌ 钉钉机器人连接测试失败")
-            except Exception as e:
-                logger.error(f"❌ 钉钉机器人连接测试异常: {str(e)}")
+        # 钉钉连接状态由首次实际发送确定，不再单独发送测试消息
+        sender = DingTalkSender(webhook_url=dingtalk_webhook)
         
         # 运行多指数分析
         logger.info("=== 开始多指数投研分析 ===")
         
         # 设置 send_summary=False 来只发送指数报告而不发送总结报告
-        analyzer = MultiIndexAnalyzer(indexes, send_summary=False, dingtalk_webhook=dingtalk_webhook)
+        analyzer = MultiIndexAnalyzer(indexes, send_summary=False, dingtalk_webhook=dingtalk_webhook, sender=sender)
         analysis_results, send_results = analyzer.run_full_analysis()
         
+        if args.debug:
+            _log_debug_details(analysis_results, send_results)
+        
+        # 只有实际发出过报告（分析成功且内容非空）时，connection_ok 为False才说明连接失败
+        send_attempted = any(r.success and r.report_html and not r.report_html.isspace()
+                             for r in analysis_results)
+        if send_results and send_attempted and not sender.connection_ok:
+            logger.error("❌ 钉钉机器人连接失败，所有报告均未发送成功")
+        
         # 输出结果统计
-        success_count = sum(1 for r in analysis_results if r.success)
-        sent_count = sum(1 for sent in send_results.values() if sent)
+        stats = compute_analysis_stats(analysis_results, send_results)
         
         logger.info(f"=== 分析完成 ===")
-        logger.info(f"成功分析: {success_count}/{len(indexes)} 个指数")
-        logger.info(f"成功发送: {sent_count}/{len(indexes)} 个报告")
+        logger.info(f"成功分析: {stats.success_count}/{len(indexes)} 个指数")
+        logger.info(f"成功发送: {stats.sent_count}/{len(indexes)} 个报告")
         
         # 详细结果
-        for result in analysis_results:
-            status = "✓" if result.success else "✗"
-            sent_status = "📤" if send_results.get(result.index_config.code, False) else "📭"
-            logger.info(f"{status} {sent_status} {result.index_config.name}")
+        for result, sent in stats.rows:
+            logger.info("%s %s %s", "✓" if result.success else "✗", "📤" if sent else "📭", result.index_config.name)
             if not result.success:
-                logger.error(f"  错误: {result.error_message}")
+                logger.error("  错误: %s", result.error_message)
         
         return 0
         
     except Exception as e:
-        logger.error(f"程序执行过程中发生错误: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("程序执行过程中发生错误: %s", e)
         return 1
 
 if __name__ == "__main__":
-    exit_code = main()
-    sys.exit(exit_code)
\ No newline at end of file
+    raise SystemExit(main())
\ No newline at end of file
@@ -2,7 +2,10 @@
 多指数数据处理器 - 处理多个指数的数据收集和分析
 """
 
+import functools
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple
 from dataclasses import dataclass
 from datetime import datetime
@@ -15,6 +18,15 @@ from dingtalk_sender import DingTalkSender
 
 logger = logging.getLogger(__name__)
 
+# 并发分析的最大线程数
+MAX_WORKERS = 16
+
+# 并发发送钉钉消息的最大线程数（钉钉机器人限制每分钟20条消息）
+SEND_MAX_WORKERS = 4
+
+# 报告生成器复用同一个Figure绘制趋势图，报告（图表）生成需串行执行
+_report_lock = threading.Lock()
+
 @dataclass
 class IndexAnalysisResult:
     """单个指数分析结果"""
@@ -26,10 +38,41 @@ class IndexAnalysisResult:
     success: bool     # 是否成功
     error_message: str = ""  # 错误信息
 
+@dataclass
+class AnalysisStats:
+    """批量分析统计结果"""
+    total_count: int    # 指数总数
+    success_count: int  # 分析成功数
+    sent_count: int     # 发送成功数
+    rows: List[Tuple[IndexAnalysisResult, bool]]  # (分析结果, 是否发送成功)
+
+def compute_analysis_stats(analysis_results: List[IndexAnalysisResult],
+                           send_results: Dict[str, bool] = None) -> AnalysisStats:
+    """
+    一次遍历统计分析与发送结果
+    
+    Args:
+        analysis_results: 分析结果
+        send_results: 发送结果（可选），按指数代码索引
+        
+    Returns:
+        AnalysisStats: 统计结果
+    """
+    send_results = send_results or {}
+    success_count = sent_count = 0
+    rows = []
+    for result in analysis_results:
+        sent = bool(send_results.get(result.index_config.code, False))
+        success_count += result.success
+        sent_count += sent
+        rows.append((result, sent))
+    return AnalysisStats(len(analysis_results), success_count, sent_count, rows)
+
 class MultiIndexAnalyzer:
     """多指数分析器"""
     
-    def __init__(self, indexes: List[IndexConfig] = None, send_summary: bool = True, dingtalk_webhook: str = None):
+    def __init__(self, indexes: List[IndexConfig] = None, send_summary: bool = True, dingtalk_webhook: str = None,
+                 max_workers: int = None, sender: DingTalkSender = None):
         """
         初始化多指数分析器
         
@@ -37,29 +80,33 @@ class MultiIndexAnalyzer:
             indexes: 要分析的指数列表，如果为None则使用全局配置
             send_summary: 是否发送总结报告，默认True
             dingtalk_webhook: 钉钉机器人webhook地址，默认None（使用环境变量或默认值）
+            max_workers: 并发分析的线程数，默认None（每个指数一个线程，最多MAX_WORKERS个）
+            sender: 已创建的钉钉发送器，默认None（按dingtalk_webhook新建）
         """
         self.indexes = indexes or index_manager.get_all_indexes()
         self.send_summary = send_summary
+        self.max_workers = max_workers
         self.data_collector = DataCollector()
         self.data_processor = DataProcessor()
         self.report_generator = ReportGenerator()
-        self.dingtalk_sender = DingTalkSender(webhook_url=dingtalk_webhook)
+        self.dingtalk_sender = sender or DingTalkSender(webhook_url=dingtalk_webhook)
     
-    def analyze_single_index(self, index_config: IndexConfig) -> IndexAnalysisResult:
+    def analyze_single_index(self, index_config: IndexConfig, shared_bond: Dict = None) -> IndexAnalysisResult:
         """
         分析单个指数
         
         Args:
             index_config: 指数配置
+            shared_bond: 已获取的国债收益率数据（与指数无关，可在多个指数间共享），默认None时自行获取
             
         Returns:
             IndexAnalysisResult: 分析结果
         """
         try:
-            logger.info(f"开始分析指数: {index_config.name}({index_config.code})")
+            logger.info("开始分析指数: %s(%s)", index_config.name, index_config.code)
             
             # 1. 数据收集
-            logger.info(f"获取数据: {index_config.url}")
+            logger.info("获取数据: %s", index_config.url)
             raw_data = self.data_collector.fetch_csv_data(index_config.url)
             
             # 2. 数据验证
@@ -82,13 +129,13 @@ class MultiIndexAnalyzer:
                         'pe': valuation_data.get('pe'),
                         'pe_percentile': valuation_data.get('pe_percentile', 50)
                     })
-                    logger.info(f"成功获取估值数据: PE={valuation_data.get('pe')}")
+                    logger.info("成功获取估值数据: PE=%s", valuation_data.get('pe'))
             except Exception as e:
-                logger.warning(f"获取估值数据失败: {str(e)}")
+                logger.warning("获取估值数据失败: %s", e)
             
             # 3.6 获取国债收益率数据
             try:
-                bond_yield = self.data_collector.fetch_bond_yield()
+                bond_yield = shared_bond if shared_bond is not None else self.data_collector.fetch_bond_yield()
                 if bond_yield:
                     processed_data['metrics']['bond_yield'] = bond_yield.get('current_yield')
                     processed_data['metrics']['bond_yield_change'] = bond_yield.get('yield_change')
@@ -97,17 +144,18 @@ class MultiIndexAnalyzer:
                         processed_data['metrics']['dividend_bond_spread'] = (
                             processed_data['metrics']['current_rate'] - bond_yield.get('current_yield')
                         )
-                    logger.info(f"成功获取国债收益率: {bond_yield.get('current_yield')}%")
+                    logger.info("成功获取国债收益率: %s%%", bond_yield.get('current_yield'))
             except Exception as e:
-                logger.warning(f"获取国债收益率失败: {str(e)}")
+                logger.warning("获取国债收益率失败: %s", e)
             
             # 4. 报告生成
-            report_html, chart_path = self.report_generator.generate_report(
-                processed_data, 
-                output_dir=f"reports/{index_config.code}"
-            )
+            with _report_lock:
+                report_html, chart_path = self.report_generator.generate_report(
+                    processed_data, 
+                    output_dir=f"reports/{index_config.code}"
+                )
             
-            logger.info(f"指数 {index_config.name} 分析完成")
+            logger.info("指数 %s 分析完成", index_config.name)
             
             return IndexAnalysisResult(
                 index_config=index_config,
@@ -119,7 +167,7 @@ class MultiIndexAnalyzer:
             )
             
         except Exception as e:
-            logger.error(f"指数 {index_config.name} 分析失败: {str(e)}")
+            logger.error("指数 %s 分析失败: %s", index_config.name, e)
             return IndexAnalysisResult(
                 index_config=index_config,
                 raw_data=None,
@@ -138,21 +186,26 @@ class MultiIndexAnalyzer:
             List[IndexAnalysisResult]: 所有指数的分析结果
         """
         logger.info(f"开始批量分析 {len(self.indexes)} 个指数")
-        results = []
         
-        for index_config in self.indexes:
-            result = self.analyze_single_index(index_config)
-            results.append(result)
-            
+        # 国债收益率与具体指数无关，只获取一次后共享给所有指数
+        shared_bond = self.data_collector.fetch_bond_yield()
+        analyze = functools.partial(self.analyze_single_index, shared_bond=shared_bond)
+        
+        # 数据下载为I/O密集型，按指数并发执行，结果保持配置顺序
+        max_workers = self.max_workers or min(MAX_WORKERS, len(self.indexes)) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(analyze, self.indexes))
+        
+        for index_config, result in zip(self.indexes, results):
             # 记录进度
             if result.success:
-                logger.info(f"✓ {index_config.name} 分析成功")
+                logger.info("✓ %s 分析成功", index_config.name)
             else:
-                logger.error(f"✗ {index_config.name} 分析失败: {result.error_message}")
+                logger.error("✗ %s 分析失败: %s", index_config.name, result.error_message)
         
         # 统计结果
-        success_count = sum(1 for r in results if r.success)
-        logger.info(f"批量分析完成: {success_count}/{len(results)} 个指数分析成功")
+        stats = compute_analysis_stats(results)
+        logger.info(f"批量分析完成: {stats.success_count}/{stats.total_count} 个指数分析成功")
         
         return results
     
@@ -166,55 +219,68 @@ class MultiIndexAnalyzer:
         Returns:
             Dict[str, bool]: 每个指数的发送结果
         """
-        send_results = {}
-        
         # 检查钉钉发送器配置
         logger.info(f"钉钉发送器配置检查 - Webhook URL: {self.dingtalk_sender.webhook_url[:50]}...")
         
-        for result in results:
-            try:
-                if result.success:
-                    logger.info(f"发送 {result.index_config.name} 的分析报告")
-                    # 构造指数信息
-                    index_info = {
-                        'name': result.index_config.name,
-                        'code': result.index_config.code,
-                        'description': result.index_config.description
-                    }
-                    
-                    # 检查报告内容
-                    if not result.report_html or len(result.report_html.strip()) == 0:
-                        logger.warning(f"⚠️ {result.index_config.name} 报告内容为空，跳过发送")
-                        send_results[result.index_config.code] = False
-                        continue
-                    
-                    success = self.dingtalk_sender.send_report(
-                        result.report_html, 
-                        result.chart_path,
-                        index_info=index_info,
-                        processed_data=result.processed_data
-                    )
-                    send_results[result.index_config.code] = success
-                    
-                    if success:
-                        logger.info(f"✓ {result.index_config.name} 报告发送成功")
-                    else:
-                        logger.error(f"✗ {result.index_config.name} 报告发送失败")
-                else:
-                    logger.warning(f"跳过发送 {result.index_config.name}: 分析失败")
-                    send_results[result.index_config.code] = False
-                    
-            except Exception as e:
-                logger.error(f"发送 {result.index_config.name} 报告时出错: {str(e)}")
-                logger.exception("详细错误信息:")
-                send_results[result.index_config.code] = False
+        # 各报告的发送相互独立（I/O密集），并发发送；线程数较小以免触发钉钉频率限制。
+        # 消息到达钉钉群的顺序不保证与指数配置顺序一致，返回结果仍按配置顺序排列
+        max_workers = min(SEND_MAX_WORKERS, len(results)) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            sent = list(executor.map(self._send_single_result, results))
+        send_results = {result.index_config.code: ok for result, ok in zip(results, sent)}
         
         # 统计发送结果
-        total_sent = len([r for r in send_results.values() if r])
+        total_sent = sum(sent)
         logger.info(f"📊 发送统计: 成功 {total_sent}/{len(send_results)} 个报告")
         
         return send_results
     
+    def _send_single_result(self, result: IndexAnalysisResult) -> bool:
+        """
+        通过钉钉发送单个指数的分析结果
+        
+        Args:
+            result: 单个指数的分析结果
+            
+        Returns:
+            bool: 发送是否成功
+        """
+        try:
+            if not result.success:
+                logger.warning("跳过发送 %s: 分析失败", result.index_config.name)
+                return False
+            
+            logger.info("发送 %s 的分析报告", result.index_config.name)
+            # 构造指数信息
+            index_info = {
+                'name': result.index_config.name,
+                'code': result.index_config.code,
+                'description': result.index_config.description
+            }
+            
+            # 检查报告内容
+            if not result.report_html or result.report_html.isspace():
+                logger.warning("⚠️ %s 报告内容为空，跳过发送", result.index_config.name)
+                return False
+            
+            success = self.dingtalk_sender.send_report(
+                result.report_html, 
+                result.chart_path,
+                index_info=index_info,
+                processed_data=result.processed_data
+            )
+            
+            if success:
+                logger.info("✓ %s 报告发送成功", result.index_config.name)
+            else:
+                logger.error("✗ %s 报告发送失败", result.index_config.name)
+            return success
+                
+        except Exception as e:
+            logger.error("发送 %s 报告时出错: %s", result.index_config.name, e)
+            logger.exception("详细错误信息:")
+            return False
+    
     def run_full_analysis(self) -> Tuple[List[IndexAnalysisResult], Dict[str, bool]]:
         """
         运行完整的多指数分析流程
@@ -249,64 +315,36 @@ class MultiIndexAnalyzer:
         Args:
             analysis_results: 分析结果
             send_results: 发送结果
+            include_summary: 是否生成总结报告，False时直接跳过
         """
-        total_count = len(analysis_results)
-        success_count = sum(1 for r in analysis_results if r.success)
-        sent_count = sum(1 for sent in send_results.values() if sent)
+        if not include_summary:
+            logger.info("跳过发送总结报告")
+            return
+        
+        stats = compute_analysis_stats(analysis_results, send_results)
         
-        summary = f"""
+        parts = [f"""
 📊 多指数投研分析总结
 ========================
 
 📈 分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-🔢 指数总数: {total_count}
-✅ 分析成功: {success_count}
-❌ 分析失败: {total_count - success_count}
-📤 发送成功: {sent_count}
+🔢 指数总数: {stats.total_count}
+✅ 分析成功: {stats.success_count}
+❌ 分析失败: {stats.total_count - stats.success_count}
+📤 发送成功: {stats.sent_count}
 
 详细结果:
-"""
+"""]
         
-        for result in analysis_results:
+        for result, sent in stats.rows:
             status = "✅" if result.success else "❌"
-            sent_status = "📤" if send_results.get(result.index_config.code, False) else "📭"
-            summary += f"\n{status} {sent_status} {result.index_config.name} ({result.index_config.code})"
-            if not result.success:
-                summary += f" - {result.error_message}"
+            sent_status = "📤" if sent else "📭"
+            error = "" if result.success else f" - {result.error_message}"
+            parts.append(f"\n{status} {sent_status} {result.index_config.name} ({result.index_config.code}){error}")
+        summary = "".join(parts)
         
-        # 禁用summary报告发送，只发送单个指数的日报
-        if False:  # 暂时禁用summary报告
-            try:
-                # 构造包含多个指数信息的总结标题
-                index_names = [result.index_config.name for result in analysis_results if result.success]
-                indices_str = " & ".join(index_names)
-                summary_with_indices = f"📊 {indices_str} 综合分析总结\n\n{summary}"
-                
-                # 为总结报告提供特殊的指数信息
-                summary_index_info = {
-                    'name': f'{indices_str} 综合分析',
-                    'code': 'SUMMARY',
-                    'description': f'包含 {len(index_names)} 个指数的综合分析'
-                }
-                
-                # 计算汇总指标
-                summary_metrics = {}
-                if analysis_results and analysis_results[0].success:
-                    # 使用第一个成功分析的指数数据作为汇总数据
-                    first_metrics = analysis_results[0].processed_data.get('metrics', {})
-                    summary_metrics = first_metrics.copy()
-                
-                self.dingtalk_sender.send_report(
-                    summary_with_indices, 
-                    None,
-                    index_info=summary_index_info,
-                    processed_data={'metrics': summary_metrics}
-                )
-                logger.info("总结报告发送成功")
-            except Exception as e:
-                logger.error(f"总结报告发送失败: {str(e)}")
-        else:
-            logger.info("跳过发送总结报告")
+        # 总结报告不通过钉钉发送（只发送单个指数的日报），仅写入日志
+        logger.info(summary)
 
 # 便利函数
 def run_multi_index_analysis(indexes: List[IndexConfig] = None) -> Tuple[List[IndexAnalysisResult], Dict[str, bool]]:
@@ -0,0 +1,90 @@
+"""
+单指数分析流水线 - 数据收集、处理、报告生成与（可选）钉钉发送
+"""
+
+import logging
+
+from data_collector import DataCollector
+from data_processor import DataProcessor
+from report_generator import ReportGenerator
+
+logger = logging.getLogger(__name__)
+
+def analyze_single_index(index_config, *, generator_cls=ReportGenerator, sender=None, output_dir=None):
+    """
+    分析单个指数
+
+    Args:
+        index_config: 指数配置
+        generator_cls: 报告生成器类（ReportGenerator 或 OptimizedReportGenerator）
+        sender: 钉钉发送器（可选），为None时不发送
+        output_dir: 报告输出目录（可选）
+
+    Returns:
+        dict: 分析结果，包含 success / index_config / processed_data 或 error
+    """
+    try:
+        logger.info("开始分析指数: %s(%s)", index_config.name, index_config.code)
+
+        # 1. 数据收集
+        collector = DataCollector()
+
+        # 获取股息率数据
+        csv_data = collector.fetch_csv_data(index_config.url)
+
+        # 获取估值数据（PE）
+        valuation_data = collector.fetch_valuation_data(index_config.code)
+
+        # 获取国债收益率数据（10年期）
+        bond_yield_data = collector.fetch_bond_yield('10y')
+
+        # 2. 数据处理（整合所有数据）
+        processor = DataProcessor()
+        processed_data = processor.analyze_data(csv_data, bond_yield_data)
+
+        # 将估值数据添加到处理结果中
+        if valuation_data and valuation_data.get('pe') is not None:
+            processed_data['metrics']['pe'] = valuation_data['pe']
+
+        # 添加指数信息
+        processed_data['index_info'] = {
+            'name': index_config.name,
+            'code': index_config.code,
+            'description': index_config.description
+        }
+
+        # 3. 报告生成
+        generator = generator_cls()
+
+        # 生成器只需要图表数据、指标和分析时间
+        analysis_data = {
+            'processed_data': processed_data['processed_data'],
+            'metrics': processed_data.get('metrics', {}),
+            'analysis_time': processed_data.get('analysis_time')
+        }
+        report_html, chart_path = generator.generate_report(analysis_data, output_dir=output_dir)
+
+        # 4. 钉钉发送（可选）
+        success = True
+        if sender is not None:
+            success = sender.send_report(report_html, chart_path,
+                                         index_info=processed_data['index_info'],
+                                         processed_data=processed_data)
+            if success:
+                logger.info("%s 报告发送成功", index_config.name)
+            else:
+                logger.error("%s 报告发送失败", index_config.name)
+
+        return {
+            'success': success,
+            'index_config': index_config,
+            'processed_data': processed_data
+        }
+
+    except Exception as e:
+        logger.error("指数 %s 分析失败: %s", index_config.name, e)
+        return {
+            'success': False,
+            'index_config': index_config,
+            'error': str(e)
+        }
@@ -2,10 +2,10 @@
 报告生成模块 - 负责生成图表和HTML报告
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+from matplotlib.figure import Figure
 import pandas as pd
 import numpy as np
+import itertools
 import logging
 import os
 from datetime import datetime
@@ -22,75 +22,174 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 清理matplotlib字体缓存（兼容不同版本）
+# 重建会扫描整个系统字体目录，仅在设置 HLNOTE_REBUILD_FONTS 时执行（字体缓存过期时设置一次即可）
 import matplotlib.font_manager
-try:
-    # 新版本matplotlib
-    matplotlib.font_manager._rebuild()
-except AttributeError:
-    # 旧版本matplotlib或其他情况
-    pass
-except Exception as e:
-    logger.warning(f"字体缓存重建失败: {e}")
+if os.environ.get('HLNOTE_REBUILD_FONTS'):
+    try:
+        # 新版本matplotlib
+        matplotlib.font_manager._rebuild()
+    except AttributeError:
+        # 旧版本matplotlib或其他情况
+        pass
+    except Exception as e:
+        logger.warning(f"字体缓存重建失败: {e}")
 
 # 检查是否在GitHub Actions环境中
 if 'GITHUB_ACTIONS' in os.environ:
     # GitHub Actions环境，使用系统可用的中文字体
     try:
         # 尝试使用STHeiti或Songti等系统自带中文字体
-        plt.rcParams['font.sans-serif'] = ['STHeiti', 'Songti SC', 'DejaVu Sans', 'sans-serif']
-        plt.rcParams['axes.unicode_minus'] = False
+        matplotlib.rcParams['font.sans-serif'] = ['STHeiti', 'Songti SC', 'DejaVu Sans', 'sans-serif']
+        matplotlib.rcParams['axes.unicode_minus'] = False
         # 设置字体大小
-        plt.rcParams['font.size'] = 12
+        matplotlib.rcParams['font.size'] = 12
         logger.info("GitHub Actions环境使用STHeiti/Songti中文字体")
     except Exception as e:
         logger.warning(f"GitHub Actions中文字体设置失败: {e}")
         # 使用默认字体
-        plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'sans-serif']
-        plt.rcParams['axes.unicode_minus'] = False
+        matplotlib.rcParams['font.sans-serif'] = ['DejaVu Sans', 'sans-serif']
+        matplotlib.rcParams['axes.unicode_minus'] = False
 else:
     # 本地环境，使用系统可用的中文字体
     try:
         # 优先使用STHeiti，其次是Songti，然后是系统默认字体
-        plt.rcParams['font.sans-serif'] = ['STHeiti', 'Songti SC', 'Kaiti SC', 'DejaVu Sans', 'sans-serif']
-        plt.rcParams['axes.unicode_minus'] = False
+        matplotlib.rcParams['font.sans-serif'] = ['STHeiti', 'Songti SC', 'Kaiti SC', 'DejaVu Sans', 'sans-serif']
+        matplotlib.rcParams['axes.unicode_minus'] = False
         logger.info("本地环境使用STHeiti/Songti中文字体")
     except Exception as e:
         logger.warning(f"本地中文字体设置失败: {e}")
-        plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'sans-serif']
-        plt.rcParams['axes.unicode_minus'] = False
+        matplotlib.rcParams['font.sans-serif'] = ['DejaVu Sans', 'sans-serif']
+        matplotlib.rcParams['axes.unicode_minus'] = False
+
+def _save_webp(fig: Figure, buf: BytesIO, dpi: int):
+    """
+    将图表编码为无损WebP写入buf（直接取Agg渲染的RGBA像素，由Pillow编码）
+    
+    Args:
+        fig: 图表
+        buf: 输出缓冲区
+        dpi: 分辨率
+    """
+    from PIL import Image
+    raw = BytesIO()
+    fig.savefig(raw, format='rgba', dpi=dpi)
+    width = int(round(fig.get_figwidth() * dpi))
+    height = len(raw.getvalue()) // (4 * width)
+    Image.frombuffer('RGBA', (width, height), raw.getbuffer(), 'raw', 'RGBA', 0, 1).save(
+        buf, format='WEBP', lossless=True, method=0)
+
+# 基础报告的页面头部（<head>及样式），内容固定，模块加载时构造一次
+_REPORT_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>中证红利低波指数投研报告</title>
+            <style>
+                body { font-family: 'Microsoft YaHei', Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }
+                .container { max-width: 800px; margin: 0 auto; background: white; border-radius: 10px; box-shadow: 0 0 20px rgba(0,0,0,0.1); overflow: hidden; }
+                .header { background: linear-gradient(135deg, #2E86AB 0%, #A23B72 100%); color: white; padding: 30px; text-align: center; }
+                .header h1 { margin: 0; font-size: 28px; }
+                .header p { margin: 10px 0 0 0; opacity: 0.9; }
+                .content { padding: 30px; }
+                .metrics-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }
+                .metric-card { background: #f8f9fa; border-radius: 8px; padding: 20px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+                .metric-value { font-size: 24px; font-weight: bold; color: #2E86AB; }
+                .metric-label { font-size: 14px; color: #666; margin-top: 5px; }
+                .metric-subtext { font-size: 12px; color: #888; margin-top: 2px; }
+                .chart-container { text-align: center; margin: 30px 0; }
+                .chart-container img, .chart-container svg { max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1); }
+                .analysis { background: #e8f4f8; border-left: 4px solid #2E86AB; padding: 20px; margin: 20px 0; border-radius: 0 8px 8px 0; }
+                .footer { text-align: center; padding: 20px; color: #666; font-size: 12px; border-top: 1px solid #eee; }
+                .trend-indicator { display: inline-block; padding: 5px 15px; border-radius: 20px; font-weight: bold; }
+                .trend-up { background: #d4edda; color: #155724; }
+                .trend-down { background: #f8d7da; color: #721c24; }
+                .trend-flat { background: #fff3cd; color: #856404; }
+            </style>
+        </head>
+"""
 
-# 全局设置
-plt.rcParams['figure.autolayout'] = True
+# 日报简洁版的页面头部（<head>及样式），内容固定，模块加载时构造一次
+_DAILY_REPORT_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>AI投研日报 - 简洁版</title>
+            <style>
+                body { font-family: 'Microsoft YaHei', Arial, sans-serif; margin: 0; padding: 15px; background-color: #f8f9fa; }
+                .container { max-width: 600px; margin: 0 auto; background: white; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden; }
+                .header { background: linear-gradient(135deg, #2E86AB 0%, #A23B72 100%); color: white; padding: 20px; text-align: center; }
+                .header h1 { margin: 0; font-size: 20px; }
+                .header p { margin: 5px 0 0 0; opacity: 0.9; font-size: 14px; }
+                .content { padding: 20px; }
+                .metrics-grid { display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px; margin: 15px 0; }
+                .metric-card { background: #f8f9fa; border-radius: 6px; padding: 15px; text-align: center; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }
+                .metric-value { font-size: 18px; font-weight: bold; color: #2E86AB; }
+                .metric-label { font-size: 12px; color: #666; margin-top: 3px; }
+                .advice-section { background: #e8f4f8; border-radius: 8px; padding: 15px; margin: 15px 0; }
+                .advice-title { font-size: 16px; font-weight: bold; margin-bottom: 10px; color: #2E86AB; }
+                .advice-action { font-size: 24px; font-weight: bold; margin: 10px 0; }
+                .buy { color: #28a745; }
+                .hold { color: #ffc107; }
+                .sell { color: #dc3545; }
+                .confidence-bar { background: #e9ecef; height: 8px; border-radius: 4px; margin: 8px 0; overflow: hidden; }
+                .confidence-fill { height: 100%; }
+                .footer { text-align: center; padding: 15px; color: #666; font-size: 11px; border-top: 1px solid #eee; }
+            </style>
+        </head>
+"""
 
 class ReportGenerator:
     """报告生成器"""
     
-    def __init__(self, output_dir: str = "reports"):
+    # 数值标签的背景框样式（所有标签共用，matplotlib 内部会复制）
+    _LABEL_BBOX = dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8, edgecolor='none')
+    
+    # 趋势图最多标注的数据点数
+    _MAX_LABELS = 15
+    
+    # 图表文件序号（同一秒内生成多张图表时避免文件名冲突，所有实例共用）
+    _chart_seq = itertools.count()
+    
+    def __init__(self, output_dir: str = "reports", dpi: int = 120, chart_format: str = "png"):
         """
         初始化报告生成器
         
         Args:
             output_dir: 输出目录
+            dpi: 图表分辨率（报告容器最宽800px，120dpi下10x5英寸图表为1200x600像素）
+            chart_format: 图表格式，'png'（base64内嵌图片）、'webp'（无损WebP，比PNG更小、编码更快）
+                或 'svg'（直接内联矢量图，页面更小）
         """
+        if chart_format not in ('png', 'webp', 'svg'):
+            raise ValueError(f"不支持的图表格式: {chart_format}")
         self.output_dir = output_dir
+        self.dpi = dpi
+        self.chart_format = chart_format
+        # 趋势图复用同一个Figure（不注册到pyplot），generate_chart 不可重入
+        self._chart_fig = None
+        self._chart_ax = None
         self.ensure_output_dir()
         
     def ensure_output_dir(self):
         """确保输出目录存在"""
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
-            logger.info(f"创建输出目录: {self.output_dir}")
+        os.makedirs(self.output_dir, exist_ok=True)
     
-    def generate_report(self, analysis_data: Dict, output_dir: str = None) -> Tuple[str, str]:
+    def generate_report(self, analysis_data: Dict, output_dir: str = None,
+                        include_chart: bool = True, embed_chart: bool = True) -> Tuple[str, str]:
         """
         生成完整报告
         
         Args:
             analysis_data: 分析数据字典
             output_dir: 输出目录，如果提供则使用此目录
+            include_chart: 是否生成趋势图，为False时跳过图表渲染，报告中不包含图表
+            embed_chart: 是否将图表内嵌到HTML中；为False且提供了output_dir时，
+                报告通过相对路径引用同目录下的图表文件（报告需与图表一起发布）
             
         Returns:
-            Tuple[str, str]: (HTML报告内容, 图表文件路径)
+            Tuple[str, str]: (HTML报告内容, 图表文件路径)，不生成图表时路径为空字符串
         """
         try:
             logger.info("开始生成报告...")
@@ -98,11 +197,22 @@ class ReportGenerator:
             # 确定输出目录
             target_output_dir = output_dir or self.output_dir
             
-            # 生成图表
-            chart_path = self.generate_chart(analysis_data['processed_data'], target_output_dir)
+            # 生成图表（同时得到内存中的内嵌内容，无需再从磁盘读回）
+            chart_path, chart_embed = "", ""
+            if include_chart:
+                chart_path, chart_embed = self._render_chart(analysis_data['processed_data'], target_output_dir)
             
             # 生成HTML报告
-            html_content = self.generate_html_report(analysis_data, chart_path, target_output_dir)
+            if not embed_chart and output_dir and chart_path:
+                chart_href = os.path.relpath(chart_path, output_dir).replace(os.sep, '/')
+                html_content = self.generate_html_report(analysis_data, chart_path, target_output_dir,
+                                                         chart_href=chart_href, include_chart=include_chart)
+            elif self.chart_format == 'svg':
+                html_content = self.generate_html_report(analysis_data, chart_path, target_output_dir,
+                                                         chart_svg=chart_embed, include_chart=include_chart)
+            else:
+                html_content = self.generate_html_report(analysis_data, chart_path, target_output_dir,
+                                                         chart_base64=chart_embed, include_chart=include_chart)
             
             logger.info("报告生成完成")
             
@@ -131,68 +241,162 @@ class ReportGenerator:
         Returns:
             str: 图表文件路径
         """
+        return self._render_chart(df, output_dir)[0]
+    
+    def generate_chart_pdf(self, df: pd.DataFrame, output_dir: str = None) -> str:
+        """
+        生成PDF格式的股息率趋势图：坐标轴、刻度和标题保持矢量，
+        折线和数值标签栅格化，放大后依然清晰且文件较小
+        
+        Args:
+            df: 处理后的数据框
+            output_dir: 输出目录，如果提供则使用此目录
+            
+        Returns:
+            str: PDF文件路径，失败时为空字符串
+        """
         try:
-            if 'dividend_rate' not in df.columns or 'date' not in df.columns:
-                logger.warning("数据中缺少必要的列，无法生成图表")
+            fig = self._draw_chart(df)
+            if fig is None:
                 return ""
             
-            # 准备数据
-            dates = df['date']
-            rates = df['dividend_rate']
-            
-            # 创建图表
-            fig, ax = plt.subplots(figsize=(12, 6))
-            
-            # 绘制折线图
-            ax.plot(dates, rates, marker='o', linewidth=2, markersize=6, color='#2E86AB')
-            
-            # 添加网格
-            ax.grid(True, alpha=0.3)
-            
-            # 设置标题和标签
-            ax.set_title('中证红利低波指数股息率趋势 (15日)', fontsize=16, pad=20)
-            ax.set_xlabel('日期', fontsize=12)
-            ax.set_ylabel('股息率 (%)', fontsize=12)
+            for artist in itertools.chain(self._chart_ax.lines, self._chart_ax.texts):
+                artist.set_rasterized(True)
+            chart_path = self._new_chart_path(output_dir, 'pdf')
+            fig.savefig(chart_path, format='pdf', dpi=self.dpi)
             
-            # 格式化x轴日期
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
-            ax.xaxis.set_major_locator(mdates.DayLocator(interval=2))
-            plt.xticks(rotation=45)
+            logger.info(f"图表已保存至: {chart_path}")
+            return chart_path
             
-            # 调整Y轴范围，避免标签被截断
-            y_min, y_max = rates.min(), rates.max()
-            y_range = y_max - y_min
-            ax.set_ylim(y_min - y_range * 0.1, y_max + y_range * 0.15)
+        except Exception as e:
+            logger.error(f"PDF图表生成失败: {str(e)}")
+            return ""
+    
+    def _render_chart(self, df: pd.DataFrame, output_dir: str = None) -> Tuple[str, str]:
+        """
+        生成股息率趋势图，先渲染到内存再写入磁盘
+        
+        Args:
+            df: 处理后的数据框
+            output_dir: 输出目录，如果提供则使用此目录
             
-            # 添加数值标签（优化位置，避免重叠）
-            for i, (date, rate) in enumerate(zip(dates, rates)):
-                # 根据位置调整标签位置
-                offset_y = 10 if i % 2 == 0 else -15
-                ax.annotate(f'{rate:.3f}', (date, rate), 
-                           textcoords="offset points", xytext=(0, offset_y), ha='center',
-                           fontsize=8, color='#2E86AB',
-                           bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8, edgecolor='none'))            
-            # 调整布局
-            plt.tight_layout()
+        Returns:
+            Tuple[str, str]: (图表文件路径, 内嵌内容)，内嵌内容为PNG/WebP的base64编码或SVG标记
+            （取决于 chart_format），失败时均为空字符串
+        """
+        try:
+            fig = self._draw_chart(df)
+            if fig is None:
+                return "", ""
             
             # 保存图表
-            target_output_dir = output_dir or self.output_dir
-            # 确保输出目录存在
-            os.makedirs(target_output_dir, exist_ok=True)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            chart_filename = f'dividend_trend_{timestamp}.png'
-            chart_path = os.path.join(target_output_dir, chart_filename)
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            chart_path = self._new_chart_path(output_dir, self.chart_format)
+            buf = BytesIO()
+            if self.chart_format == 'svg':
+                fig.savefig(buf, format='svg')
+            elif self.chart_format == 'webp':
+                _save_webp(fig, buf, self.dpi)
+            else:
+                fig.savefig(buf, format='png', dpi=self.dpi)
+            chart_data = buf.getvalue()
+            with open(chart_path, 'wb') as f:
+                f.write(chart_data)
             
             logger.info(f"图表已保存至: {chart_path}")
-            return chart_path
+            if self.chart_format == 'svg':
+                # 去掉XML声明和DOCTYPE，只保留可直接内联到HTML的<svg>元素
+                svg_text = chart_data.decode('utf-8')
+                return chart_path, svg_text[svg_text.index('<svg'):]
+            return chart_path, base64.b64encode(chart_data).decode('ascii')
             
         except Exception as e:
             logger.error(f"图表生成失败: {str(e)}")
-            return ""
+            return "", ""
+    
+    def _draw_chart(self, df: pd.DataFrame) -> Figure:
+        """
+        在复用的图表上绘制股息率趋势图
+        
+        Args:
+            df: 处理后的数据框
+            
+        Returns:
+            Figure: 绘制好的图表，数据中缺少必要的列时返回None
+        """
+        if 'dividend_rate' not in df.columns or 'date' not in df.columns:
+            logger.warning("数据中缺少必要的列，无法生成图表")
+            return None
+        
+        # 准备数据：按日期升序，横轴使用数据点序号，日期刻度文字预先格式化，
+        # 避免每次绘制时由日期定位器/格式化器逐个计算刻度
+        df = df.sort_values('date')
+        rates_arr = df['dividend_rate'].to_numpy()
+        xs = np.arange(len(rates_arr))
+        tick_labels = df['date'].dt.strftime('%m-%d').to_numpy()
+        
+        # 创建图表（首次调用时创建，之后清空复用）
+        if self._chart_fig is None:
+            self._chart_fig = Figure(figsize=(10, 5))
+            self._chart_ax = self._chart_fig.subplots()
+            # 图表布局固定，直接设置边距，避免保存时再做一次bbox_inches='tight'的测量绘制
+            self._chart_fig.subplots_adjust(left=0.08, right=0.98, top=0.90, bottom=0.18)
+        fig, ax = self._chart_fig, self._chart_ax
+        ax.clear()
+        
+        # 绘制折线图
+        ax.plot(xs, rates_arr, marker='o', linewidth=2, markersize=6, color='#2E86AB')
+        
+        # 添加网格
+        ax.grid(True, alpha=0.3)
+        
+        # 设置标题和标签
+        ax.set_title('中证红利低波指数股息率趋势 (15日)', fontsize=16, pad=20)
+        ax.set_xlabel('日期', fontsize=12)
+        ax.set_ylabel('股息率 (%)', fontsize=12)
+        
+        # x轴每隔一个数据点标注日期
+        ax.set_xticks(xs[::2])
+        ax.set_xticklabels(tick_labels[::2])
+        ax.tick_params(axis='x', labelrotation=45)
+        
+        # 调整Y轴范围，避免标签被截断
+        y_min, y_max = rates_arr.min(), rates_arr.max()
+        y_range = y_max - y_min
+        ax.set_ylim(y_min - y_range * 0.1, y_max + y_range * 0.15)
+        
+        # 添加数值标签（优化位置，避免重叠）
+        # 数据点超过 _MAX_LABELS 个时按等间隔抽样标注，避免标签过密
+        step = -(-len(rates_arr) // self._MAX_LABELS)
+        label_xs, label_rates = xs[::step], rates_arr[::step]
+        # 标签上下交替偏移，一次性计算偏移量和标签文本，循环内只创建标注
+        offsets = np.where(np.arange(len(label_rates)) % 2 == 0, 10, -15)
+        labels = np.char.mod('%.3f', label_rates)
+        for x, rate, label, offset_y in zip(label_xs.tolist(), label_rates, labels.tolist(), offsets.tolist()):
+            ax.annotate(label, (x, rate), 
+                       textcoords="offset points", xytext=(0, offset_y), ha='center',
+                       fontsize=8, color='#2E86AB', bbox=self._LABEL_BBOX)
+        
+        return fig
     
-    def generate_html_report(self, analysis_data: Dict, chart_path: str, output_dir: str = None) -> str:
+    def _new_chart_path(self, output_dir: str, ext: str) -> str:
+        """
+        生成新的图表文件路径（时间戳加序号，同一秒内也不重复），并确保输出目录存在
+        
+        Args:
+            output_dir: 输出目录，为None时使用默认目录
+            ext: 文件扩展名
+            
+        Returns:
+            str: 图表文件路径
+        """
+        target_output_dir = output_dir or self.output_dir
+        os.makedirs(target_output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return os.path.join(target_output_dir, f'dividend_trend_{timestamp}_{next(self._chart_seq):03d}.{ext}')
+    
+    def generate_html_report(self, analysis_data: Dict, chart_path: str, output_dir: str = None,
+                             chart_base64: str = None, chart_svg: str = None, include_chart: bool = True,
+                             chart_href: str = None) -> str:
         """
         生成HTML报告
         
@@ -200,6 +404,10 @@ class ReportGenerator:
             analysis_data: 分析数据
             chart_path: 图表路径
             output_dir: 输出目录
+            chart_base64: 图表PNG的base64编码（可选），未提供时从chart_path读取
+            chart_svg: 内联SVG图表（可选），提供时优先于PNG图片
+            include_chart: 是否包含趋势图区域
+            chart_href: 图表文件的相对链接（可选），提供时引用该文件而不内嵌图表
             
         Returns:
             str: HTML内容
@@ -207,41 +415,46 @@ class ReportGenerator:
         metrics = analysis_data.get('metrics', {})
         trend_analysis = self._get_trend_analysis_text(metrics)
         
-        # 读取图表并转为base64
-        chart_base64 = ""
-        if os.path.exists(chart_path):
-            with open(chart_path, 'rb') as f:
-                chart_base64 = base64.b64encode(f.read()).decode()
+        # 读取图表并转为base64（generate_report 已直接传入内存中的编码）
+        if chart_base64 is None and chart_svg is None and chart_href is None and include_chart:
+            chart_base64 = ""
+            if os.path.exists(chart_path):
+                with open(chart_path, 'rb') as f:
+                    chart_base64 = base64.b64encode(f.read()).decode('ascii')
         
-        html_template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>中证红利低波指数投研报告</title>
-            <style>
-                body {{ font-family: 'Microsoft YaHei', Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5; }}
-                .container {{ max-width: 800px; margin: 0 auto; background: white; border-radius: 10px; box-shadow: 0 0 20px rgba(0,0,0,0.1); overflow: hidden; }}
-                .header {{ background: linear-gradient(135deg, #2E86AB 0%, #A23B72 100%); color: white; padding: 30px; text-align: center; }}
-                .header h1 {{ margin: 0; font-size: 28px; }}
-                .header p {{ margin: 10px 0 0 0; opacity: 0.9; }}
-                .content {{ padding: 30px; }}
-                .metrics-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }}
-                .metric-card {{ background: #f8f9fa; border-radius: 8px; padding: 20px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }}
-                .metric-value {{ font-size: 24px; font-weight: bold; color: #2E86AB; }}
-                .metric-label {{ font-size: 14px; color: #666; margin-top: 5px; }}
-                .metric-subtext {{ font-size: 12px; color: #888; margin-top: 2px; }}
-                .chart-container {{ text-align: center; margin: 30px 0; }}
-                .chart-container img {{ max-width: 100%; height: auto; border-radius: 8px; box-shadow: 0 4px 15px rgba(0,0,0,0.1); }}
-                .analysis {{ background: #e8f4f8; border-left: 4px solid #2E86AB; padding: 20px; margin: 20px 0; border-radius: 0 8px 8px 0; }}
-                .footer {{ text-align: center; padding: 20px; color: #666; font-size: 12px; border-top: 1px solid #eee; }}
-                .trend-indicator {{ display: inline-block; padding: 5px 15px; border-radius: 20px; font-weight: bold; }}
-                .trend-up {{ background: #d4edda; color: #155724; }}
-                .trend-down {{ background: #f8d7da; color: #721c24; }}
-                .trend-flat {{ background: #fff3cd; color: #856404; }}
-            </style>
-        </head>
-        <body>
+        chart_section = ""
+        if include_chart:
+            # 图表区域：内联SVG > 相对链接 > base64内嵌图片
+            if chart_svg:
+                chart_html = chart_svg
+            elif chart_href:
+                chart_html = f'<img src="{chart_href}" alt="股息率趋势图">'
+            elif chart_base64:
+                mime = 'webp' if self.chart_format == 'webp' else 'png'
+                chart_html = f'<img src="data:image/{mime};base64,{chart_base64}" alt="股息率趋势图">'
+            else:
+                chart_html = '<p>图表生成失败</p>'
+            chart_section = f"""<div class="chart-container">
+                        <h3>📈 股息率趋势图 (15日)</h3>
+                        {chart_html}
+                    </div>"""
+        
+        # 模板中多次使用的指标和由其派生的文本只计算一次
+        daily_change = metrics.get('daily_change', 0)
+        trend_class = 'up' if daily_change > 0 else 'down' if daily_change < 0 else 'flat'
+        trend_text = '📈 上升趋势' if daily_change > 0 else '📉 下降趋势' if daily_change < 0 else '➡️ 横盘整理'
+        relative_to_avg = '偏高' if metrics.get('current_rate', 0) > metrics.get('avg_15d', 0) else '偏低'
+        percentile = metrics.get('percentile_15d', 50)
+        percentile_level = '较高' if percentile > 70 else '较低' if percentile < 30 else '中等'
+        pe = metrics.get('pe')
+        spread = metrics.get('dividend_bond_spread')
+        advice = metrics.get('investment_advice') or {}
+        action = advice.get('action')
+        action_color = '#28a745' if action == '买入' else '#ffc107' if action == '持有' else '#dc3545'
+        action_label = '🟢 建议买入' if action == '买入' else '🟡 建议持有' if action == '持有' else '🔴 建议卖出'
+        confidence = advice.get('confidence', 0.5)
+        
+        html_template = f"""{_REPORT_HEAD}        <body>
             <div class="container">
                 <div class="header">
                     <h1>📈 中证红利低波指数投研报告</h1>
@@ -281,49 +494,46 @@ class ReportGenerator:
                             {'<div class="metric-subtext">10年期</div>' if metrics.get('bond_name') else ''}
                         </div>
                         <div class="metric-card">
-                            <div class="metric-value">{self._format_metric(metrics.get('dividend_bond_spread'), 'N/A', '.2f')}%</div>
+                            <div class="metric-value">{self._format_metric(spread, 'N/A', '.2f')}%</div>
                             <div class="metric-label">股息率溢价</div>
-                            {'<div class="metric-subtext">' + ('优势' if metrics.get('dividend_bond_spread', 0) > 0 else '劣势') + '</div>' if metrics.get('dividend_bond_spread') is not None else ''}
+                            {'<div class="metric-subtext">' + ('优势' if spread > 0 else '劣势') + '</div>' if spread is not None else ''}
                         </div>
                     </div>
                     
                     <div class="analysis">
                         <h3>🎯 趋势分析</h3>
                         <p>{trend_analysis}</p>
-                        <span class="trend-indicator trend-{'up' if metrics.get('daily_change', 0) > 0 else 'down' if metrics.get('daily_change', 0) < 0 else 'flat'}">
-                            {'📈 上升趋势' if metrics.get('daily_change', 0) > 0 else '📉 下降趋势' if metrics.get('daily_change', 0) < 0 else '➡️ 横盘整理'}
+                        <span class="trend-indicator trend-{trend_class}">
+                            {trend_text}
                         </span>
                     </div>
                     
-                    <div class="chart-container">
-                        <h3>📈 股息率趋势图 (15日)</h3>
-                        {'<img src="data:image/png;base64,' + chart_base64 + '" alt="股息率趋势图">' if chart_base64 else '<p>图表生成失败</p>'}
-                    </div>
+                    {chart_section}
                     
                     <div class="analysis">
                         <h3>💡 多指标综合分析</h3>
                         <ul>
-                            <li>股息率分析：当前股息率相对15日均值{'偏高' if metrics.get('current_rate', 0) > metrics.get('avg_15d', 0) else '偏低'}，历史分位数为{metrics.get('percentile_15d', 0):.1f}%，处于{'较高' if metrics.get('percentile_15d', 50) > 70 else '较低' if metrics.get('percentile_15d', 50) < 30 else '中等'}水平</li>
-                            {'<li>估值分析：PE估值' + ('较低' if metrics.get('pe', 20) < 15 else '较高' if metrics.get('pe', 20) > 25 else '合理') + f'({metrics.get("pe", "N/A")}倍)</li>' if metrics.get('pe') else ''}
-                            {'<li>国债对比：股息率相对10年期国债收益率' + ('有显著优势' if metrics.get('dividend_bond_spread', 0) > 1.0 else '基本相当' if metrics.get('dividend_bond_spread', 0) > 0 else '处于劣势') + f'(差额{metrics.get("dividend_bond_spread", 0):.2f}%)</li>' if metrics.get('dividend_bond_spread') is not None else ''}
+                            <li>股息率分析：当前股息率相对15日均值{relative_to_avg}，历史分位数为{metrics.get('percentile_15d', 0):.1f}%，处于{percentile_level}水平</li>
+                            {'<li>估值分析：PE估值' + ('较低' if pe < 15 else '较高' if pe > 25 else '合理') + f'({pe}倍)</li>' if pe else ''}
+                            {'<li>国债对比：股息率相对10年期国债收益率' + ('有显著优势' if spread > 1.0 else '基本相当' if spread > 0 else '处于劣势') + f'(差额{spread:.2f}%)</li>' if spread is not None else ''}
                         </ul>
                     </div>
                     
                     <div class="analysis" style="background: #e8f4f8; border-left: 4px solid #2E86AB;">
                         <h3>🎯 投资决策建议</h3>
                         {'<div style="margin: 15px 0;">' + 
-                         '<div style="font-size: 20px; font-weight: bold; color: ' + ('#28a745' if metrics.get('investment_advice', {}).get('action') == '买入' else '#ffc107' if metrics.get('investment_advice', {}).get('action') == '持有' else '#dc3545') + '; margin-bottom: 10px;">' +
-                         ('🟢 建议买入' if metrics.get('investment_advice', {}).get('action') == '买入' else '🟡 建议持有' if metrics.get('investment_advice', {}).get('action') == '持有' else '🔴 建议卖出') + '</div>' +
+                         '<div style="font-size: 20px; font-weight: bold; color: ' + action_color + '; margin-bottom: 10px;">' +
+                         action_label + '</div>' +
                          '<div style="background: #f8f9fa; padding: 15px; border-radius: 8px; margin: 10px 0;">' +
-                         '<strong>信心度：</strong>' + f'{metrics.get("investment_advice", {}).get("confidence", 0.5):.1%}' + '<br>' +
+                         '<strong>信心度：</strong>' + f'{confidence:.1%}' + '<br>' +
                          '<div style="background: #e9ecef; height: 10px; border-radius: 5px; margin: 5px 0 10px 0; overflow: hidden;">' +
-                         '<div style="background: ' + ('#28a745' if metrics.get('investment_advice', {}).get('action') == '买入' else '#ffc107' if metrics.get('investment_advice', {}).get('action') == '持有' else '#dc3545') + f'; width: {metrics.get("investment_advice", {}).get("confidence", 0.5) * 100}%; height: 100%;"></div>' +
+                         '<div style="background: ' + action_color + f'; width: {confidence * 100}%; height: 100%;"></div>' +
                          '</div>' +
-                         '<strong>理由：</strong>' + (', '.join(metrics.get('investment_advice', {}).get('reasons', ['基于综合分析'])) if metrics.get('investment_advice', {}).get('reasons') else '基于综合分析') + '<br>' +
-                         '<strong>风险：</strong>' + (', '.join(metrics.get('investment_advice', {}).get('risks', ['市场波动风险'])) if metrics.get('investment_advice', {}).get('risks') else '市场波动风险') + '<br>' +
-                         '<strong>摘要：</strong>' + metrics.get('investment_advice', {}).get('summary', '建议结合个人风险承受能力做投资决策') +
+                         '<strong>理由：</strong>' + (', '.join(advice['reasons']) if advice.get('reasons') else '基于综合分析') + '<br>' +
+                         '<strong>风险：</strong>' + (', '.join(advice['risks']) if advice.get('risks') else '市场波动风险') + '<br>' +
+                         '<strong>摘要：</strong>' + advice.get('summary', '建议结合个人风险承受能力做投资决策') +
                          '</div>' +
-                         '</div>' if metrics.get('investment_advice') else '<p>投资决策建议生成中...</p>'}
+                         '</div>' if advice else '<p>投资决策建议生成中...</p>'}
                     </div>
                 </div>
                 
@@ -413,35 +623,7 @@ class ReportGenerator:
         
         trend_arrow = '📈' if change_percent > 0 else '📉' if change_percent < 0 else '➡️'
         
-        html_template = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>AI投研日报 - 简洁版</title>
-            <style>
-                body {{ font-family: 'Microsoft YaHei', Arial, sans-serif; margin: 0; padding: 15px; background-color: #f8f9fa; }}
-                .container {{ max-width: 600px; margin: 0 auto; background: white; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden; }}
-                .header {{ background: linear-gradient(135deg, #2E86AB 0%, #A23B72 100%); color: white; padding: 20px; text-align: center; }}
-                .header h1 {{ margin: 0; font-size: 20px; }}
-                .header p {{ margin: 5px 0 0 0; opacity: 0.9; font-size: 14px; }}
-                .content {{ padding: 20px; }}
-                .metrics-grid {{ display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px; margin: 15px 0; }}
-                .metric-card {{ background: #f8f9fa; border-radius: 6px; padding: 15px; text-align: center; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
-                .metric-value {{ font-size: 18px; font-weight: bold; color: #2E86AB; }}
-                .metric-label {{ font-size: 12px; color: #666; margin-top: 3px; }}
-                .advice-section {{ background: #e8f4f8; border-radius: 8px; padding: 15px; margin: 15px 0; }}
-                .advice-title {{ font-size: 16px; font-weight: bold; margin-bottom: 10px; color: #2E86AB; }}
-                .advice-action {{ font-size: 24px; font-weight: bold; margin: 10px 0; }}
-                .buy {{ color: #28a745; }}
-                .hold {{ color: #ffc107; }}
-                .sell {{ color: #dc3545; }}
-                .confidence-bar {{ background: #e9ecef; height: 8px; border-radius: 4px; margin: 8px 0; overflow: hidden; }}
-                .confidence-fill {{ height: 100%; }}
-                .footer {{ text-align: center; padding: 15px; color: #666; font-size: 11px; border-top: 1px solid #eee; }}
-            </style>
-        </head>
-        <body>
+        html_template = f"""{_DAILY_REPORT_HEAD}        <body>
             <div class="container">
                 <div class="header">
                     <h1>📊 AI投研日报</h1>
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+测试 DataCollector 国债收益率获取（使用桩对象，不访问网络）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+import data_collector
+from data_collector import DataCollector
+
+def _stub_bond_china_yield(calls):
+    def bond_china_yield():
+        calls.append(1)
+        return pd.DataFrame({
+            '曲线名称': ['中债国债收益率曲线', '中债国债收益率曲线'],
+            '日期': ['2024-01-02', '2024-01-01'],
+            '10年': [2.5, 2.4],
+            '5年': [2.2, 2.1],
+            '1年': [1.8, 1.7]
+        })
+    return bond_china_yield
+
+def test_bond_yield_fetched_once_per_day(monkeypatch):
+    calls = []
+    monkeypatch.setattr(data_collector.ak, 'bond_china_yield', _stub_bond_china_yield(calls))
+    data_collector._fetch_bond_china_yield.cache_clear()
+    collector = DataCollector()
+
+    assert collector.fetch_bond_yield('10y')['current_yield'] == 2.5
+    assert collector.fetch_bond_yield('5y')['current_yield'] == 2.2
+    assert DataCollector().fetch_bond_yield('10y')['current_yield'] == 2.5
+    assert len(calls) == 1
+    data_collector._fetch_bond_china_yield.cache_clear()
+
+class StubResponse:
+    """HTTP响应桩"""
+
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise data_collector.requests.HTTPError(str(self.status_code))
+
+class StubSession:
+    """HTTP会话桩：带 If-None-Match 且ETag匹配时返回304"""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        headers = kwargs.get('headers', {})
+        self.calls.append(headers)
+        if headers.get('If-None-Match') == '"v1"':
+            return StubResponse(304)
+        return StubResponse(200, self.content, {'ETag': '"v1"'})
+
+def test_download_revalidates_disk_cache(tmp_path):
+    csv = ('date,dividend_rate\n' + '20240101,4.0\n' * 100).encode('utf-8')
+    session = StubSession(csv)
+    url = 'http://example.invalid/data.csv'
+
+    first = DataCollector(session=session, cache_dir=str(tmp_path)).fetch_csv_data(url)
+    second = DataCollector(session=session, cache_dir=str(tmp_path)).fetch_csv_data(url)
+
+    assert first.equals(second) and len(second) == 100
+    assert 'If-None-Match' not in session.calls[0]
+    assert session.calls[1]['If-None-Match'] == '"v1"'
+
+def test_download_ignores_corrupt_cache(tmp_path):
+    csv = ('date,dividend_rate\n' + '20240101,4.0\n' * 100).encode('utf-8')
+    session = StubSession(csv)
+    url = 'http://example.invalid/data.csv'
+    collector = DataCollector(session=session, cache_dir=str(tmp_path))
+    collector.fetch_csv_data(url)
+    for meta_path in tmp_path.glob('*.json'):
+        meta_path.write_text('{"etag": "\\"v1', encoding='utf-8')
+
+    df = collector.fetch_csv_data(url)
+
+    assert len(df) == 100
+    assert 'If-None-Match' not in session.calls[1]
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith('.tmp-')] == []
+    assert collector.fetch_csv_data(url).equals(df)
+    assert session.calls[2]['If-None-Match'] == '"v1"'
@@ -7,18 +7,37 @@ import os
 import sys
 import logging
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(message)s',
-    handlers=[
-        logging.FileHandler('test_dingtalk.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# 指数信息
+test_index_info = {
+    'name': '测试指数',
+    'code': 'TEST001',
+    'description': '测试用指数'
+}
+
+# 处理数据
+test_processed_data = {
+    'metrics': {
+        'current_rate': 5.0,
+        'avg_15d': 4.9,
+        'max_15d': 5.1,
+        'min_15d': 4.8,
+        'change_percent': 0.5,
+        'percentile_15d': 50.0
+    }
+}
+
 def main():
+    # 配置日志（在main中配置，导入本文件时不会创建日志文件）
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(message)s',
+        handlers=[
+            logging.FileHandler('test_dingtalk.log'),
+            logging.StreamHandler()
+        ]
+    )
     logger.info("=== 开始极简钉钉测试 ===")
     
     # 获取 webhook
@@ -42,42 +61,15 @@ def main():
         sender = DingTalkSender(webhook_url=webhook)
         logger.info("✅ 创建发送器成功")
         
-        # 测试连接（发送测试消息）
-        logger.info("📤 发送测试消息...")
-        test_result = sender.test_connection()
-        if test_result:
-            logger.info("✅ 测试消息发送成功")
-        else:
-            logger.error("❌ 测试消息发送失败")
-        
-        # 直接发送简单报告
+        # 直接发送简单报告（首次发送成功即说明连接正常，无需单独发送测试消息）
         logger.info("📤 发送简单报告...")
         html_content = "<h1>测试报告</h1><p>这是一个测试报告</p>"
         
-        # 构造指数信息
-        index_info = {
-            'name': '测试指数',
-            'code': 'TEST001',
-            'description': '测试用指数'
-        }
-        
-        # 构造处理数据
-        processed_data = {
-            'metrics': {
-                'current_rate': 5.0,
-                'avg_15d': 4.9,
-                'max_15d': 5.1,
-                'min_15d': 4.8,
-                'change_percent': 0.5,
-                'percentile_15d': 50.0
-            }
-        }
-        
         report_result = sender.send_report(
             html_content,
             chart_path=None,
-            index_info=index_info,
-            processed_data=processed_data
+            index_info=test_index_info,
+            processed_data=test_processed_data
         )
         
         if report_result:
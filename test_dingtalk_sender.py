@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+测试 DingTalkSender 发送逻辑（使用桩对象，不访问网络）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import dingtalk_sender
+from dingtalk_sender import DingTalkSender
+
+TEST_WEBHOOK = 'https://oapi.dingtalk.com/robot/send?access_token=test'
+
+class StubResponse:
+    """钉钉API响应桩"""
+
+    def __init__(self, errcode):
+        self.errcode = errcode
+
+    def json(self):
+        return {'errcode': self.errcode, 'errmsg': 'ok' if self.errcode == 0 else 'error'}
+
+class StubSession:
+    """HTTP会话桩，按顺序返回预设的errcode"""
+
+    def __init__(self, errcodes):
+        self.errcodes = errcodes
+        self.calls = []
+
+    def post(self, url, **kwargs):
+        self.calls.append(url)
+        return StubResponse(self.errcodes[len(self.calls) - 1])
+
+def test_default_session_is_shared():
+    assert DingTalkSender(webhook_url=TEST_WEBHOOK).session is dingtalk_sender._SESSION
+    assert DingTalkSender(webhook_url=TEST_WEBHOOK).session is DingTalkSender().session
+
+def test_connection_ok_set_by_first_successful_send():
+    session = StubSession([1, 0, 0])
+    sender = DingTalkSender(webhook_url=TEST_WEBHOOK, session=session)
+
+    assert sender.connection_ok is False
+    assert sender._send_message({'msgtype': 'text'}) is False
+    assert sender.connection_ok is False
+    assert sender._send_message({'msgtype': 'text'}) is True
+    assert sender.connection_ok is True
+    assert sender._send_message({'msgtype': 'text'}) is True
+    assert session.calls == [TEST_WEBHOOK] * 3
+
+def test_daily_report_filenames_unique_within_same_second(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    sender = DingTalkSender(webhook_url=TEST_WEBHOOK, session=StubSession([]))
+    index_info = {'name': '测试指数', 'code': 'TEST001', 'description': '测试'}
+
+    sender._build_dingtalk_message('<html></html>', index_info=index_info)
+    sender._build_dingtalk_message('<html></html>', index_info=index_info)
+
+    files = os.listdir(tmp_path / 'reports' / 'daily')
+    assert len(files) == 2
+    assert all(name.startswith('daily_report_TEST001_') for name in files)
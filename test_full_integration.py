@@ -7,10 +7,11 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from multi_index_analyzer import MultiIndexAnalyzer
-from index_config import IndexConfig
-
 def main():
+    # 在函数内导入，pytest收集本文件时无需加载分析器及其依赖
+    from multi_index_analyzer import MultiIndexAnalyzer
+    from index_config import IndexConfig
+    
     print("=== 完整集成测试 ===")
     
     # 模拟真实的指数配置
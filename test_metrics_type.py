@@ -7,20 +7,24 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from data_processor import DataProcessor
-import pandas as pd
-import numpy as np
-
 def create_test_data():
     """创建测试数据"""
+    # 在函数内导入，pytest收集本文件时无需加载pandas/numpy
+    import pandas as pd
+    import numpy as np
+    
+    # 固定种子，每次运行生成相同的数据
+    rng = np.random.default_rng(20240101)
     dates = pd.date_range('2024-01-01', '2024-01-20', freq='D')
     data = {
         '日期Date': dates,
-        '股息率2（计算用股本）D/P2': np.random.uniform(4.5, 5.5, 20)
+        '股息率2（计算用股本）D/P2': rng.uniform(4.5, 5.5, 20)
     }
     return pd.DataFrame(data)
 
 def main():
+    from data_processor import DataProcessor
+    
     print("=== 检查 metrics 数据类型 ===")
     
     df = create_test_data()
@@ -33,8 +37,7 @@ def main():
     if 'metrics' in result:
         metrics = result['metrics']
         print("\n=== metrics 内容 ===")
-        for key, value in metrics.items():
-            print(f"{key}: {value} (类型: {type(value).__name__})")
+        print("\n".join(f"{key}: {value} (类型: {type(value).__name__})" for key, value in metrics.items()))
     else:
         print("没有找到 metrics")
     
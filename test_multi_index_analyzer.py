@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+测试 MultiIndexAnalyzer 批量分析（使用桩对象，不访问网络）
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from multi_index_analyzer import MultiIndexAnalyzer, IndexAnalysisResult, compute_analysis_stats
+from index_config import IndexConfig
+
+test_indexes = [
+    IndexConfig(name=f'测试指数{i}', code=f'TEST00{i}', url=f'http://example.invalid/TEST00{i}indicator.xls')
+    for i in range(4)
+]
+
+BOND_YIELD_DATA = {'current_yield': 2.5, 'yield_change': 0.1}
+
+def _stub_result(index_config, shared_bond=None):
+    # 越靠前的指数完成越晚，验证结果仍按配置顺序返回
+    time.sleep(0.01 * (len(test_indexes) - test_indexes.index(index_config)))
+    return IndexAnalysisResult(
+        index_config=index_config,
+        raw_data=None,
+        processed_data={},
+        report_html="<html></html>",
+        chart_path="",
+        success=True
+    )
+
+def test_analyze_all_indexes_keeps_order(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    analyzer = MultiIndexAnalyzer(test_indexes, dingtalk_webhook='https://oapi.dingtalk.com/robot/send?access_token=test')
+    monkeypatch.setattr(analyzer.data_collector, 'fetch_bond_yield', lambda bond_type='10y': BOND_YIELD_DATA)
+    monkeypatch.setattr(analyzer, 'analyze_single_index', _stub_result)
+
+    results = analyzer.analyze_all_indexes()
+
+    assert [r.index_config.code for r in results] == [idx.code for idx in test_indexes]
+
+def test_analyze_all_indexes_fetches_bond_yield_once(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    analyzer = MultiIndexAnalyzer(test_indexes, dingtalk_webhook='https://oapi.dingtalk.com/robot/send?access_token=test')
+    fetches = []
+    received = []
+    monkeypatch.setattr(analyzer.data_collector, 'fetch_bond_yield',
+                        lambda bond_type='10y': fetches.append(bond_type) or BOND_YIELD_DATA)
+    monkeypatch.setattr(analyzer, 'analyze_single_index',
+                        lambda index_config, shared_bond=None: received.append(shared_bond) or _stub_result(index_config))
+
+    analyzer.analyze_all_indexes()
+
+    assert len(fetches) == 1
+    assert received == [BOND_YIELD_DATA] * len(test_indexes)
+
+class StubSender:
+    """钉钉发送器桩，记录发送的指数代码"""
+    webhook_url = 'https://oapi.dingtalk.com/robot/send?access_token=test'
+
+    def __init__(self):
+        self.sent = []
+
+    def send_report(self, html_content, chart_path=None, index_info=None, processed_data=None):
+        self.sent.append(index_info['code'])
+        return index_info['code'] != 'TEST001'
+
+def test_send_results_via_dingtalk(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    sender = StubSender()
+    analyzer = MultiIndexAnalyzer(test_indexes, sender=sender)
+    results = [_stub_result(idx) for idx in test_indexes]
+    results[2].success = False
+    results[3].report_html = "  "
+
+    send_results = analyzer.send_results_via_dingtalk(results)
+
+    assert list(send_results) == [idx.code for idx in test_indexes]
+    assert send_results == {'TEST000': True, 'TEST001': False, 'TEST002': False, 'TEST003': False}
+    assert sorted(sender.sent) == ['TEST000', 'TEST001']
+
+def test_compute_analysis_stats():
+    results = [_stub_result(idx) for idx in test_indexes]
+    results[1].success = False
+    send_results = {'TEST000': True, 'TEST001': False, 'TEST002': True}
+
+    stats = compute_analysis_stats(results, send_results)
+
+    assert (stats.total_count, stats.success_count, stats.sent_count) == (4, 3, 2)
+    assert [sent for _, sent in stats.rows] == [True, False, True, False]
+    assert compute_analysis_stats(results).sent_count == 0
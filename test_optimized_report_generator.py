@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+测试 OptimizedReportGenerator 报告生成（离线，使用构造数据）
+"""
+
+import sys
+import os
+import base64
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from optimized_report_generator import OptimizedReportGenerator
+
+def _chart_data():
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=15)[::-1],
+        'dividend_rate': [4.0 + i * 0.01 for i in range(15)]
+    })
+
+def test_report_embeds_rendered_chart(tmp_path):
+    generator = OptimizedReportGenerator(output_dir=str(tmp_path))
+    analysis_data = {'processed_data': _chart_data(), 'metrics': {}, 'analysis_time': '2024-01-15 00:00:00'}
+
+    html, chart_path = generator.generate_report(analysis_data, output_dir=str(tmp_path))
+
+    with open(chart_path, 'rb') as f:
+        assert base64.b64encode(f.read()).decode() in html
+    assert (tmp_path / 'optimized_index.html').read_text(encoding='utf-8') == html
+
+def test_chart_figure_reused_between_reports(tmp_path):
+    generator = OptimizedReportGenerator(output_dir=str(tmp_path))
+
+    first = generator.generate_chart(_chart_data(), str(tmp_path / 'a'))
+    fig = generator._chart_fig
+    second = generator.generate_chart(_chart_data(), str(tmp_path / 'b'))
+
+    assert os.path.exists(first) and os.path.exists(second)
+    assert generator._chart_fig is fig
+    assert len(generator._chart_ax.texts) == len(_chart_data())
+
+def test_svg_chart_inlined(tmp_path):
+    generator = OptimizedReportGenerator(output_dir=str(tmp_path), chart_format='svg')
+    analysis_data = {'processed_data': _chart_data(), 'metrics': {}, 'analysis_time': '2024-01-15 00:00:00'}
+
+    html, chart_path = generator.generate_report(analysis_data, output_dir=str(tmp_path))
+
+    assert chart_path.endswith('.svg')
+    assert '<svg' in html and 'data:image/png' not in html
+
+def test_chart_filenames_unique_within_same_second(tmp_path):
+    generator = OptimizedReportGenerator(output_dir=str(tmp_path))
+
+    paths = {generator.generate_chart(_chart_data(), str(tmp_path)) for _ in range(3)}
+
+    assert len(paths) == 3
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+测试 pipeline.analyze_single_index（使用桩对象，不访问网络）
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pipeline
+from index_config import IndexConfig
+
+test_index = IndexConfig(name='测试指数', code='TEST001', url='http://example.invalid/TEST001indicator.xls')
+
+CSV_DATA = object()
+BOND_YIELD_DATA = {'current_yield': 2.5}
+
+class StubCollector:
+    """数据收集器桩"""
+    pe = 8.5
+
+    def fetch_csv_data(self, url):
+        return CSV_DATA
+
+    def fetch_valuation_data(self, index_code):
+        return {'pe': StubCollector.pe}
+
+    def fetch_bond_yield(self, bond_type='10y'):
+        return BOND_YIELD_DATA
+
+class StubProcessor:
+    """数据处理器桩，记录调用参数"""
+    calls = []
+
+    def analyze_data(self, *args):
+        StubProcessor.calls.append(args)
+        return {'processed_data': None, 'metrics': {}, 'analysis_time': '2024-01-01 00:00:00'}
+
+class StubGenerator:
+    """报告生成器桩"""
+
+    def generate_report(self, analysis_data, output_dir=None):
+        return "<html></html>", ""
+
+class StubSender:
+    """钉钉发送器桩"""
+
+    def __init__(self, result):
+        self.result = result
+        self.sent = 0
+
+    def send_report(self, html_content, chart_path=None, index_info=None, processed_data=None):
+        self.sent += 1
+        return self.result
+
+def _run(monkeypatch, pe=8.5, sender=None):
+    monkeypatch.setattr(pipeline, 'DataCollector', StubCollector)
+    monkeypatch.setattr(pipeline, 'DataProcessor', StubProcessor)
+    monkeypatch.setattr(StubCollector, 'pe', pe)
+    StubProcessor.calls = []
+    return pipeline.analyze_single_index(test_index, generator_cls=StubGenerator, sender=sender)
+
+def test_analyze_data_receives_csv_and_bond_yield(monkeypatch):
+    _run(monkeypatch)
+    assert StubProcessor.calls == [(CSV_DATA, BOND_YIELD_DATA)]
+
+def test_pe_injected_only_when_not_none(monkeypatch):
+    result = _run(monkeypatch, pe=8.5)
+    assert result['processed_data']['metrics']['pe'] == 8.5
+
+    result = _run(monkeypatch, pe=None)
+    assert 'pe' not in result['processed_data']['metrics']
+
+def test_success_without_sender(monkeypatch):
+    result = _run(monkeypatch)
+    assert result['success'] is True
+
+def test_success_follows_sender(monkeypatch):
+    sender = StubSender(False)
+    result = _run(monkeypatch, sender=sender)
+    assert sender.sent == 1
+    assert result['success'] is False
+
+    sender = StubSender(True)
+    result = _run(monkeypatch, sender=sender)
+    assert result['success'] is True
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+测试 ReportGenerator 报告生成（离线，使用构造数据）
+"""
+
+import sys
+import os
+import base64
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from report_generator import ReportGenerator
+
+def _chart_data():
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=15)[::-1],
+        'dividend_rate': [4.0 + i * 0.01 for i in range(15)]
+    })
+
+def test_report_embeds_rendered_chart(tmp_path):
+    generator = ReportGenerator(output_dir=str(tmp_path))
+    analysis_data = {'processed_data': _chart_data(), 'metrics': {}, 'analysis_time': '2024-01-15 00:00:00'}
+
+    html, chart_path = generator.generate_report(analysis_data, output_dir=str(tmp_path))
+
+    with open(chart_path, 'rb') as f:
+        assert base64.b64encode(f.read()).decode() in html
+    assert (tmp_path / 'index.html').read_text(encoding='utf-8') == html
+
+def test_report_without_chart(tmp_path):
+    generator = ReportGenerator(output_dir=str(tmp_path))
+    analysis_data = {'processed_data': _chart_data(), 'metrics': {}, 'analysis_time': '2024-01-15 00:00:00'}
+
+    html, chart_path = generator.generate_report(analysis_data, output_dir=str(tmp_path), include_chart=False)
+
+    assert chart_path == ""
+    assert 'chart-container">' not in html
+    assert not list(tmp_path.glob('*.png'))
+
+def test_svg_chart_inlined(tmp_path):
+    generator = ReportGenerator(output_dir=str(tmp_path), chart_format='svg')
+    analysis_data = {'processed_data': _chart_data(), 'metrics': {}, 'analysis_time': '2024-01-15 00:00:00'}
+
+    html, chart_path = generator.generate_report(analysis_data, output_dir=str(tmp_path))
+
+    assert chart_path.endswith('.svg')
+    assert '<svg' in html and 'data:image/png' not in html
+
+def test_webp_chart_embedded(tmp_path):
+    generator = ReportGenerator(output_dir=str(tmp_path), chart_format='webp')
+    analysis_data = {'processed_data': _chart_data(), 'metrics': {}, 'analysis_time': '2024-01-15 00:00:00'}
+
+    html, chart_path = generator.generate_report(analysis_data, output_dir=str(tmp_path))
+
+    assert chart_path.endswith('.webp')
+    with open(chart_path, 'rb') as f:
+        assert f.read(12)[8:] == b'WEBP'
+    assert 'data:image/webp;base64,' in html
+
+def test_chart_referenced_by_relative_href(tmp_path):
+    generator = ReportGenerator(output_dir=str(tmp_path / 'charts'))
+    analysis_data = {'processed_data': _chart_data(), 'metrics': {}, 'analysis_time': '2024-01-15 00:00:00'}
+
+    html, chart_path = generator.generate_report(analysis_data, output_dir=str(tmp_path), embed_chart=False)
+
+    assert f'<img src="{os.path.basename(chart_path)}"' in html
+    assert 'base64,' not in html
+
+def test_chart_labels_thinned_for_long_series(tmp_path):
+    generator = ReportGenerator(output_dir=str(tmp_path))
+    df = pd.DataFrame({
+        'date': pd.date_range('2024-01-01', periods=60),
+        'dividend_rate': [4.0 + i * 0.01 for i in range(60)]
+    })
+
+    generator.generate_chart(_chart_data(), str(tmp_path))
+    assert len(generator._chart_ax.texts) == 15
+
+    generator.generate_chart(df, str(tmp_path))
+    assert len(generator._chart_ax.texts) == 15
+
+def test_chart_pdf_rasterizes_data_only(tmp_path):
+    generator = ReportGenerator(output_dir=str(tmp_path))
+
+    chart_path = generator.generate_chart_pdf(_chart_data())
+
+    assert chart_path.endswith('.pdf')
+    with open(chart_path, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+    assert all(line.get_rasterized() for line in generator._chart_ax.lines)
+    assert not generator._chart_ax.xaxis.get_rasterized()